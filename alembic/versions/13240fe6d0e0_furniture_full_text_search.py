@@ -0,0 +1,62 @@
+"""furniture full text search
+
+Revision ID: 13240fe6d0e0
+Revises: df28ff1c57ef
+Create Date: 2026-10-18 08:05:15.966122
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '13240fe6d0e0'
+down_revision: Union[str, Sequence[str], None] = 'df28ff1c57ef'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# trigram ищет по подстрокам, поэтому находит русские слова в любой словоформе
+FTS_TOKENIZER = 'trigram'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute(
+        "CREATE VIRTUAL TABLE furniture_fts USING fts5("
+        "description, content='furniture', content_rowid='id', "
+        f"tokenize='{FTS_TOKENIZER}')"
+    )
+    op.execute(
+        "CREATE TRIGGER furniture_fts_ai AFTER INSERT ON furniture BEGIN "
+        "INSERT INTO furniture_fts(rowid, description) VALUES (new.id, new.description); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER furniture_fts_ad AFTER DELETE ON furniture BEGIN "
+        "INSERT INTO furniture_fts(furniture_fts, rowid, description) VALUES ('delete', old.id, old.description); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER furniture_fts_au AFTER UPDATE OF description ON furniture BEGIN "
+        "INSERT INTO furniture_fts(furniture_fts, rowid, description) VALUES ('delete', old.id, old.description); "
+        "INSERT INTO furniture_fts(rowid, description) VALUES (new.id, new.description); "
+        "END"
+    )
+    op.execute("INSERT INTO furniture_fts(furniture_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute("DROP TRIGGER IF EXISTS furniture_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS furniture_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS furniture_fts_ai")
+    op.execute("DROP TABLE IF EXISTS furniture_fts")
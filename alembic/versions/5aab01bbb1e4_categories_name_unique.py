@@ -0,0 +1,35 @@
+"""categories name unique
+
+Revision ID: 5aab01bbb1e4
+Revises: bb32d7699e5c
+Create Date: 2026-10-18 09:02:14.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5aab01bbb1e4'
+down_revision: Union[str, Sequence[str], None] = 'bb32d7699e5c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # furniture ссылается на categories.name, поэтому дубли по имени можно просто убрать
+    op.execute(
+        "DELETE FROM categories WHERE id NOT IN "
+        "(SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM categories GROUP BY name) AS keep)"
+    )
+    # В SQLite индекс уже создан в a2d234cf1fe5
+    op.create_index(op.f('ix_categories_name'), 'categories', ['name'], unique=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name != 'sqlite':
+        op.drop_index(op.f('ix_categories_name'), table_name='categories')
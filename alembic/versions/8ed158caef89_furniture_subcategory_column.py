@@ -0,0 +1,60 @@
+"""furniture subcategory column
+
+Revision ID: 8ed158caef89
+Revises: 6f88e4d8a7c7
+Create Date: 2026-10-18 07:59:56.264623
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8ed158caef89'
+down_revision: Union[str, Sequence[str], None] = '6f88e4d8a7c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Раньше тип кухни хранился префиксом "[📏 Прямая кухня] " в описании. Переносим только
+# известные типы кухни и только у кухонной мебели: "[Новинка] Диван" у мягкой мебели — часть описания
+KITCHEN_TYPES = ('📏 Прямая кухня', '📐 Угловая кухня')
+KITCHEN_CATEGORY = '%ухонная%'  # «Кухонная мебель» с эмодзи и без, как "кухонная" in name.lower()
+
+furniture = sa.table(
+    'furniture',
+    sa.column('description', sa.Text),
+    sa.column('category_name', sa.String),
+    sa.column('subcategory', sa.String),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('furniture', sa.Column('subcategory', sa.String(), nullable=True))
+    op.create_index(op.f('ix_furniture_subcategory'), 'furniture', ['subcategory'], unique=False)
+
+    # Обычный UPDATE без чтения строк — работает и в offline-режиме (alembic upgrade --sql)
+    for kitchen_type in KITCHEN_TYPES:
+        prefix = f'[{kitchen_type}]'
+        op.execute(
+            furniture.update()
+            .where(furniture.c.category_name.like(KITCHEN_CATEGORY),
+                   furniture.c.description.like(f'{prefix}%'))
+            .values(subcategory=kitchen_type,
+                    description=sa.func.ltrim(sa.func.substr(furniture.c.description, len(prefix) + 1)))
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        furniture.update()
+        .where(furniture.c.subcategory.is_not(None))
+        .values(description='[' + furniture.c.subcategory + '] ' + sa.func.coalesce(furniture.c.description, ''))
+    )
+
+    op.drop_index(op.f('ix_furniture_subcategory'), table_name='furniture')
+    with op.batch_alter_table('furniture') as batch_op:
+        batch_op.drop_column('subcategory')
@@ -0,0 +1,50 @@
+"""catalog indexes
+
+Revision ID: a2d234cf1fe5
+Revises: 8ed158caef89
+Create Date: 2026-10-18 08:00:46.777763
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2d234cf1fe5'
+down_revision: Union[str, Sequence[str], None] = '8ed158caef89'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # На остальных базах уникальный индекс добавляет 5aab01bbb1e4
+    if op.get_context().dialect.name == 'sqlite':
+        # furniture ссылается на categories.name, поэтому дубли по имени можно просто убрать
+        op.execute(
+            "DELETE FROM categories WHERE id NOT IN "
+            "(SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM categories GROUP BY name) AS keep)"
+        )
+        op.create_index(op.f('ix_categories_name'), 'categories', ['name'], unique=True)
+
+    # Составной индекс с subcategory покрывает и одиночный ix_furniture_subcategory
+    op.drop_index(op.f('ix_furniture_subcategory'), table_name='furniture')
+    op.create_index('ix_furniture_catalog', 'furniture',
+                    ['category_name', 'country_origin', 'id'], unique=False)
+    op.create_index('ix_furniture_catalog_subcategory', 'furniture',
+                    ['category_name', 'country_origin', 'subcategory', 'id'], unique=False)
+
+    op.create_index('ix_furniture_photos_furniture_id', 'furniture_photos',
+                    ['furniture_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_furniture_photos_furniture_id', table_name='furniture_photos')
+    op.drop_index('ix_furniture_catalog_subcategory', table_name='furniture')
+    op.drop_index('ix_furniture_catalog', table_name='furniture')
+    op.create_index(op.f('ix_furniture_subcategory'), 'furniture', ['subcategory'], unique=False)
+    if op.get_context().dialect.name == 'sqlite':
+        op.drop_index(op.f('ix_categories_name'), table_name='categories')
@@ -0,0 +1,42 @@
+"""telegram id bigint
+
+Revision ID: ad8df686cd67
+Revises: d452f8fbe5f9
+Create Date: 2026-10-18 14:12:03.421907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ad8df686cd67'
+down_revision: Union[str, Sequence[str], None] = 'd452f8fbe5f9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # telegram_id давно вышли за пределы 32-битного INTEGER. В SQLite INTEGER и так 64-битный,
+    # таблицы пересоздавать незачем
+    if op.get_context().dialect.name == 'sqlite':
+        return
+
+    op.alter_column('users', 'telegram_id', existing_type=sa.Integer(), type_=sa.BigInteger(),
+                    existing_nullable=False)
+    op.alter_column('cooperation_requests', 'telegram_id', existing_type=sa.Integer(), type_=sa.BigInteger(),
+                    existing_nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name == 'sqlite':
+        return
+
+    op.alter_column('cooperation_requests', 'telegram_id', existing_type=sa.BigInteger(), type_=sa.Integer(),
+                    existing_nullable=False)
+    op.alter_column('users', 'telegram_id', existing_type=sa.BigInteger(), type_=sa.Integer(),
+                    existing_nullable=False)
@@ -0,0 +1,35 @@
+"""cooperation request status
+
+Revision ID: bb32d7699e5c
+Revises: ad8df686cd67
+Create Date: 2026-10-18 08:28:03.058358
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bb32d7699e5c'
+down_revision: Union[str, Sequence[str], None] = 'ad8df686cd67'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # До этой ревизии обработанные заявки удалялись — все оставшиеся новые
+    op.add_column('cooperation_requests',
+                  sa.Column('status', sa.String(length=16), server_default='new', nullable=False))
+    op.add_column('cooperation_requests', sa.Column('reviewed_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_cooperation_requests_status_id', 'cooperation_requests', ['status', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_cooperation_requests_status_id', table_name='cooperation_requests')
+    with op.batch_alter_table('cooperation_requests') as batch_op:
+        batch_op.drop_column('reviewed_at')
+        batch_op.drop_column('status')
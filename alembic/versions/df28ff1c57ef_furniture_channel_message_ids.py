@@ -0,0 +1,29 @@
+"""furniture channel message ids
+
+Revision ID: df28ff1c57ef
+Revises: a2d234cf1fe5
+Create Date: 2026-10-18 08:04:22.903645
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'df28ff1c57ef'
+down_revision: Union[str, Sequence[str], None] = 'a2d234cf1fe5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('furniture', sa.Column('channel_message_ids', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('furniture') as batch_op:
+        batch_op.drop_column('channel_message_ids')
@@ -0,0 +1,169 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Hashable, Iterable, Optional, Set, Tuple
+
+from settings import config
+
+
+class CatalogCache:
+    """
+    Ограниченный по размеру in-process кеш (LRU + TTL) для чтений каталога.
+
+    Каждая запись может быть помечена тегами — по тегу инвалидируются
+    ровно те ключи, на которые повлияло изменение в базе.
+
+    Чтение из базы и set() разделены await'ом: если тег успели инвалидировать
+    между ними, значение уже устарело. Поэтому перед запросом берется
+    generation(), и set(..., generation=...) такое значение не запишет.
+    """
+
+    def __init__(self, max_size: int = 512, ttl: float = 300.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any, Tuple[Hashable, ...]]]" = OrderedDict()
+        self._tags: Dict[Hashable, Set[Hashable]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Номер последней инвалидации и когда (по этому счетчику) инвалидировали каждый тег.
+        # Старые отметки вытесняются, а _floor помнит самую позднюю из вытесненных
+        self._generation = 0
+        self._invalidated: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._floor = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value, _ = entry
+        if expires_at < time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def generation(self) -> int:
+        return self._generation
+
+    def set(self, key: Hashable, value: Any, tags: Iterable[Hashable] = (), generation: Optional[int] = None) -> None:
+        if self.max_size <= 0:
+            return
+
+        tags = tuple(tags)
+        if generation is not None and self._invalidated_since(generation, tags):
+            return
+
+        if key in self._data:
+            self._remove(key)
+
+        self._data[key] = (time.monotonic() + self.ttl, value, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+
+        while len(self._data) > self.max_size:
+            oldest_key = next(iter(self._data))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        return self._remove(key)
+
+    def invalidate_tag(self, tag: Hashable) -> int:
+        self._generation += 1
+        self._invalidated[tag] = self._generation
+        self._invalidated.move_to_end(tag)
+        while len(self._invalidated) > max(self.max_size, 1):
+            _, self._floor = self._invalidated.popitem(last=False)
+
+        keys = self._tags.pop(tag, set())
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._tags.clear()
+        self._generation += 1
+        self._invalidated.clear()
+        self._floor = self._generation
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _invalidated_since(self, generation: int, tags: Tuple[Hashable, ...]) -> bool:
+        if generation < self._floor:
+            # Отметка одного из тегов могла быть вытеснена — считаем значение устаревшим
+            return True
+        return any(self._invalidated.get(tag, 0) > generation for tag in tags)
+
+    def _remove(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return None
+
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+        return entry[1]
+
+
+class AdminCache:
+    """
+    Множество telegram_id администраторов в памяти.
+    Перечитывается из базы раз в ttl секунд или сразу после invalidate().
+    """
+
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+        self._admin_ids: FrozenSet[int] = frozenset()
+        self._loaded_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    async def is_admin(self, telegram_id: int, loader: Callable[[], Awaitable[Optional[Iterable[int]]]]) -> bool:
+        if time.monotonic() - self._loaded_at > self.ttl:
+            async with self._lock:
+                # Пока ждали блокировку, список мог обновить другой запрос
+                if time.monotonic() - self._loaded_at > self.ttl:
+                    admin_ids = await loader()
+                    if admin_ids is not None:
+                        self._admin_ids = frozenset(admin_ids)
+                        self._loaded_at = time.monotonic()
+        return telegram_id in self._admin_ids
+
+    def invalidate(self) -> None:
+        self._loaded_at = float("-inf")
+
+
+def catalog_tag(category_name: str, country: str, subcategory: Optional[str] = None) -> tuple:
+    return "catalog", category_name, country, subcategory
+
+
+def furniture_tag(furniture_id: int) -> tuple:
+    return "furniture", furniture_id
+
+
+def category_tag(category_name: str) -> tuple:
+    # Вся категория, любая страна: выдача inline-режима
+    return "category", category_name
+
+
+catalog_cache = CatalogCache(max_size=config.CATALOG_CACHE_SIZE, ttl=config.CATALOG_CACHE_TTL)
+# Inline-запросы приходят на каждое нажатие клавиши — одинаковые строки отдаем из памяти
+inline_cache = CatalogCache(max_size=config.INLINE_CACHE_SIZE, ttl=config.INLINE_CACHE_TTL)
+user_cache = CatalogCache(max_size=config.USER_CACHE_SIZE, ttl=config.USER_CACHE_TTL)
+admin_cache = AdminCache(ttl=config.ADMIN_CACHE_TTL)
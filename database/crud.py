@@ -1,16 +1,44 @@
 import logging
-from typing import Optional, List
+from typing import Any, Mapping, Optional, List, Sequence, Set
 
-from sqlalchemy import select, delete
+from sqlalchemy import select, func, insert, update, text, or_
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import selectinload
 
-from database.engine import AsyncSessionLocal
-from database.models import User, Cooperation, Category, Furniture, FurniturePhoto
+from database.cache import (admin_cache, catalog_cache, catalog_tag, category_tag, furniture_tag, inline_cache,
+                            user_cache)
+from database.engine import AsyncReadSessionLocal
+from database.unit_of_work import current_unit_of_work
+from database.write_queue import write_queue
+from database.models import (User, Cooperation, Category, Furniture, FurniturePhoto,
+                             COOPERATION_ACCEPTED, COOPERATION_NEW, COOPERATION_REJECTED, moscow_now)
+
+# Минимальная длина слова для поиска: FTS5 trigram индексирует триграммы
+SEARCH_MIN_TERM_LENGTH = 3
+
+
+def _session_sources():
+    """
+    Откуда CRUD-класс берет сессии: внутри апдейта — из его UnitOfWork (в блоке
+    uow.transaction() все записи и чтения идут в одной транзакции), вне апдейта —
+    пул только для чтения и общая очередь записей.
+    """
+    uow = current_unit_of_work()
+    if uow is not None:
+        return uow.session, uow
+    return AsyncReadSessionLocal, write_queue
+
+
+def _in_transaction() -> bool:
+    uow = current_unit_of_work()
+    return uow is not None and uow.in_transaction()
 
 
 class UserCrud:
     def __init__(self):
-        self.session = AsyncSessionLocal
+        self.session, self.writer = _session_sources()
 
     async def get_user_by_telegram_id(self, telegram_id: int) -> Optional[User]:
         """
@@ -21,73 +49,150 @@ class UserCrud:
             result = await session.execute(stmt)
             return result.scalar_one_or_none()
 
-    async def add_user(
+    async def get_admin_ids(self) -> Optional[Set[int]]:
+        async with self.session() as session:
+            try:
+                result = await session.execute(select(User.telegram_id).where(User.is_admin.is_(True)))
+                return set(result.scalars().all())
+
+            except SQLAlchemyError as exc:
+                logging.exception("DB error in get_admin_ids: %s", exc)
+                return None
+
+    async def set_admin(self, telegram_id: int, is_admin: bool) -> bool:
+        async def write(session):
+            stmt = update(User).where(User.telegram_id == telegram_id).values(is_admin=bool(is_admin))
+            result = await session.execute(stmt)
+            return result.rowcount > 0
+
+        try:
+            updated = await self.writer.submit(write)
+
+        except SQLAlchemyError as exc:
+            logging.exception("DB error in set_admin telegram_id=%s: %s", telegram_id, exc)
+            return False
+
+        # Права меняются сразу после COMMIT, не дожидаясь TTL кешей
+        self.writer.on_commit(admin_cache.invalidate)
+        self.writer.on_commit(lambda: user_cache.pop(telegram_id))
+        return updated
+
+    async def upsert_user(
             self,
             telegram_id: int,
             username: Optional[str],
             first_name: Optional[str],
             last_name: Optional[str],
-            is_admin: Optional[bool] = False,
     ) -> Optional[User]:
-
+        """
+        Вернуть запись пользователя, при необходимости создав ее или обновив имя.
+        Известный пользователь с прежним именем — один SELECT через пул чтения, без записи;
+        в очередь записей попадают только новые пользователи (INSERT ... ON CONFLICT
+        DO NOTHING RETURNING) и смена имени.
+        """
+        names = {"username": username, "firstname": first_name, "lastname": last_name}
         try:
-            existing = await self.get_user_by_telegram_id(telegram_id)
-            if existing:
-                logging.warning("Пользователь с telegram_id=%s уже существует в базе.", telegram_id)
-                return None
+            user = await self.get_user_by_telegram_id(telegram_id)
 
-            async with self.session() as session:
-                new_user = User(
-                    telegram_id=telegram_id,
-                    username=username,
-                    firstname=first_name,
-                    lastname=last_name,
-                    is_admin=bool(is_admin),
-                )
-
-                session.add(new_user)
-                await session.commit()
+        except SQLAlchemyError as exc:
+            logging.exception("Database error в upsert_user telegram_id=%s: %s", telegram_id, exc)
+            return None
 
-                logging.info("Пользователь создан: telegram_id=%s username=%s", telegram_id, username)
-                return new_user
+        if user is not None and all(getattr(user, field) == value for field, value in names.items()):
+            return user
+
+        async def write(session):
+            if user is None:
+                insert = postgresql_insert if session.bind.dialect.name == "postgresql" else sqlite_insert
+                stmt = insert(User).values(telegram_id=telegram_id, is_admin=False, **names).on_conflict_do_nothing(
+                    index_elements=[User.telegram_id]
+                ).returning(User)
+                created = (await session.execute(stmt)).scalar_one_or_none()
+                if created is not None:
+                    return created
+
+            # Пользователь уже есть (возможно, его только что добавил параллельный апдейт) —
+            # UPDATE срабатывает, только если имя действительно изменилось
+            stmt = update(User).where(
+                User.telegram_id == telegram_id,
+                or_(*(getattr(User, field).is_distinct_from(value) for field, value in names.items()))
+            ).values(**names).returning(User)
+            updated = (await session.execute(stmt)).scalar_one_or_none()
+            if updated is not None:
+                return updated
+
+            result = await session.execute(select(User).where(User.telegram_id == telegram_id))
+            return result.scalar_one()
 
-        except IntegrityError as exc:
-            logging.exception("IntegrityError при создании пользователя telegram_id=%s: %s", telegram_id, exc)
-            return None
+        try:
+            return await self.writer.submit(write)
 
         except SQLAlchemyError as exc:
-            logging.exception("Database error при создании пользователя telegram_id=%s: %s", telegram_id, exc)
-            return None
-
-        except Exception as exc:
-            logging.exception("Неожиданная ошибка при add_user: %s", exc)
+            logging.exception("Database error в upsert_user telegram_id=%s: %s", telegram_id, exc)
             return None
 
 
 class CrudCooperation:
     def __init__(self):
-        self.session = AsyncSessionLocal
+        self.session, self.writer = _session_sources()
 
     async def create_request(self,
                              telegram_id: int,
                              username: str,
                              text: str):
-        async with self.session() as session:
-            new_request = Cooperation(
-                telegram_id=telegram_id,
-                username=username,
-                text_requests=text
-            )
+        new_request = Cooperation(
+            telegram_id=telegram_id,
+            username=username,
+            text_requests=text
+        )
 
+        async def write(session):
             session.add(new_request)
-            await session.commit()
-            await session.refresh(new_request)
+            await session.flush()
             return new_request
 
-    async def get_all_requests(self):
+        return await self.writer.submit(write)
+
+    async def get_requests_page(self,
+                                after_id: Optional[int] = None,
+                                before_id: Optional[int] = None,
+                                limit: int = 10,
+                                status: str = COOPERATION_NEW) -> List[Cooperation]:
+        """
+        Страница заявок со статусом status по возрастанию id (keyset-пагинация по индексу
+        (status, id)). after_id — вперед от последней показанной, before_id — назад от первой.
+        """
+        async with self.session() as session:
+            try:
+                stmt = select(Cooperation).where(Cooperation.status == status)
+                if before_id is not None:
+                    stmt = stmt.where(Cooperation.id < before_id).order_by(Cooperation.id.desc())
+                else:
+                    if after_id is not None:
+                        stmt = stmt.where(Cooperation.id > after_id)
+                    stmt = stmt.order_by(Cooperation.id)
+
+                result = await session.execute(stmt.limit(limit))
+                page = list(result.scalars().all())
+
+            except SQLAlchemyError as exc:
+                logging.exception("DB error in get_requests_page: %s", exc)
+                return []
+
+        if before_id is not None:
+            page.reverse()
+        return page
+
+    async def count_requests(self, status: str = COOPERATION_NEW) -> int:
         async with self.session() as session:
-            result = await session.execute(select(Cooperation))
-            return result.scalars().all()
+            try:
+                stmt = select(func.count(Cooperation.id)).where(Cooperation.status == status)
+                result = await session.execute(stmt)
+                return result.scalar_one() or 0
+
+            except SQLAlchemyError as exc:
+                logging.exception("DB error in count_requests: %s", exc)
+                return 0
 
     async def get_requests_by_id(self, id):
         async with self.session() as session:
@@ -96,24 +201,37 @@ class CrudCooperation:
             result = get_requests.scalar_one_or_none()
             return result
 
-    async def cancel_request(self, request_id: int) -> bool:
-        async with self.session() as session:
-            stmt = delete(Cooperation).where(Cooperation.id == request_id)
-            result = await session.execute(stmt)
-            await session.commit()
-            return result.rowcount > 0
+    async def _review_request(self, request_id: int, status: str) -> Optional[Cooperation]:
+        """
+        Перевести новую заявку в status одним UPDATE ... RETURNING и вернуть ее.
+        None — заявки нет или ее уже обработал другой администратор.
+        """
+        async def write(session):
+            result = await session.execute(
+                update(Cooperation)
+                .where(Cooperation.id == request_id, Cooperation.status == COOPERATION_NEW)
+                .values(status=status, reviewed_at=moscow_now())
+                .returning(Cooperation)
+            )
+            return result.scalar_one_or_none()
 
-    async def accept_request(self, request_id: int) -> bool:
-        async with self.session() as session:
-            stmt = delete(Cooperation).where(Cooperation.id == request_id)
-            result = await session.execute(stmt)
-            await session.commit()
-            return result.rowcount > 0
+        try:
+            return await self.writer.submit(write)
+
+        except SQLAlchemyError as exc:
+            logging.exception("DB error in _review_request: %s", exc)
+            return None
+
+    async def cancel_request(self, request_id: int) -> Optional[Cooperation]:
+        return await self._review_request(request_id, COOPERATION_REJECTED)
+
+    async def accept_request(self, request_id: int) -> Optional[Cooperation]:
+        return await self._review_request(request_id, COOPERATION_ACCEPTED)
 
 
 class CrudCategory:
     def __init__(self):
-        self.session = AsyncSessionLocal
+        self.session, self.writer = _session_sources()
 
     async def check_category_by_name(self, name: str) -> bool:
         if not name:
@@ -135,28 +253,26 @@ class CrudCategory:
             logging.warning("create_category called with empty name")
             return False
 
-        async with self.session() as session:
-            try:
-                new_cat = Category(name=name, description=description)
-                session.add(new_cat)
-                await session.commit()
-                logging.info("Создана категория: %s", name)
-                return True
-
-            except IntegrityError as exc:
-                await session.rollback()
-                logging.error("IntegrityError при создании категории '%s': %s", name, exc)
-                return False
+        async def write(session):
+            session.add(Category(name=name, description=description))
+            await session.flush()
 
-            except SQLAlchemyError as exc:
-                await session.rollback()
-                logging.exception("SQLAlchemyError при создании категории '%s': %s", name, exc)
-                return False
+        try:
+            await self.writer.submit(write)
+            logging.info("Создана категория: %s", name)
+            return True
 
-            except Exception as exc:
-                await session.rollback()
-                logging.exception("Неожиданная ошибка при создании категории '%s': %s", name, exc)
-                return False
+        except IntegrityError as exc:
+            logging.error("IntegrityError при создании категории '%s': %s", name, exc)
+            return False
+
+        except SQLAlchemyError as exc:
+            logging.exception("SQLAlchemyError при создании категории '%s': %s", name, exc)
+            return False
+
+        except Exception as exc:
+            logging.exception("Неожиданная ошибка при создании категории '%s': %s", name, exc)
+            return False
 
     async def get_all_categories(self) -> List[Category]:
         async with self.session() as session:
@@ -174,17 +290,39 @@ class CrudCategory:
 
 class CrudFurniture:
     def __init__(self):
-        self.session = AsyncSessionLocal
+        self.session, self.writer = _session_sources()
+        self.cache = catalog_cache
+
+    def _cache_get(self, key):
+        """
+        Значение из кеша и поколение кеша до запроса в базу — его надо передать в _cache_set.
+        Внутри uow.transaction() чтения видят незакоммиченные строки: кеш не используется.
+        """
+        if _in_transaction():
+            return None, None
+        return self.cache.get(key), self.cache.generation()
+
+    def _cache_set(self, key, value, tags, generation: Optional[int]) -> None:
+        if generation is not None:
+            self.cache.set(key, value, tags=tags, generation=generation)
+
+    def _invalidate(self, tags) -> None:
+        # Те же теги помечают и выдачу inline-режима
+        for tag in tags:
+            self.cache.invalidate_tag(tag)
+            inline_cache.invalidate_tag(tag)
 
     async def create_furniture(
             self,
             description: str,
             category: str,
             country: str,
+            subcategory: Optional[str] = None,
     ) -> Optional[Furniture]:
         description = (description or "").strip()
         category = (category or "").strip()
         country = (country or "").strip()
+        subcategory = (subcategory or "").strip() or None
 
         if not description:
             logging.warning("Описание пустое. Не могу ничего добавить в базу!")
@@ -198,86 +336,361 @@ class CrudFurniture:
             logging.warning("Страна происхождения пустое. Не могу ничего добавить в базу!")
             return None
 
+        new_item = Furniture(
+            description=description,
+            category_name=category,
+            country_origin=country,
+            subcategory=subcategory,
+        )
+
+        async def write(session):
+            session.add(new_item)
+            await session.flush()
+            return new_item
+
+        try:
+            await self.writer.submit(write)
+
+        except SQLAlchemyError as exc:
+            logging.exception("DB error in create_furniture: %s", exc)
+            return None
+
+        except Exception as exc:
+            logging.exception("Unexpected error in create_furniture: %s", exc)
+            return None
+
+        # Новый товар попадает только в хвост выдачи и в счетчик:
+        # общий по категории и своей подкатегории, плюс inline-выдача категории
+        tags = [catalog_tag(category, country), category_tag(category)]
+        if subcategory:
+            tags.append(catalog_tag(category, country, subcategory))
+        self.writer.on_commit(lambda: self._invalidate(tags))
+
+        logging.info("Создана мебель: %s (id=%s)", description, new_item.id)
+        return new_item
+
+    async def bulk_create_furniture(self, items: Sequence[Mapping[str, Any]]) -> Optional[List[int]]:
+        """
+        Добавить пачку уже проверенных товаров вместе с фото одной записью:
+        два многострочных INSERT вместо add() и flush() на каждый товар.
+        Товар — словарь с ключами description, category_name, country_origin,
+        subcategory и photos (список file_id).
+        Вернуть id в порядке items или None при ошибке — тогда не добавлено ничего.
+        """
+        if not items:
+            return []
+
+        async def write(session):
+            result = await session.execute(
+                insert(Furniture).returning(Furniture.id, sort_by_parameter_order=True),
+                [
+                    {
+                        "description": item["description"],
+                        "category_name": item["category_name"],
+                        "country_origin": item["country_origin"],
+                        "subcategory": item["subcategory"],
+                    }
+                    for item in items
+                ],
+            )
+            ids = list(result.scalars())
+
+            photos = [
+                {"furniture_id": furniture_id, "file_id": file_id}
+                for furniture_id, item in zip(ids, items)
+                for file_id in item["photos"]
+            ]
+            if photos:
+                await session.execute(insert(FurniturePhoto), photos)
+            return ids
+
+        try:
+            ids = await self.writer.submit(write)
+
+        except SQLAlchemyError as exc:
+            logging.exception("DB error in bulk_create_furniture: %s", exc)
+            return None
+
+        except Exception as exc:
+            logging.exception("Unexpected error in bulk_create_furniture: %s", exc)
+            return None
+
+        tags = set()
+        for item in items:
+            tags.add(catalog_tag(item["category_name"], item["country_origin"]))
+            tags.add(category_tag(item["category_name"]))
+            if item["subcategory"]:
+                tags.add(catalog_tag(item["category_name"], item["country_origin"], item["subcategory"]))
+        self.writer.on_commit(lambda: self._invalidate(tags))
+
+        logging.info("Импортировано мебели: %d", len(ids))
+        return ids
+
+    @staticmethod
+    def _catalog_filters(category_name: str, country: str, kitchen_type: Optional[str] = None) -> list:
+        filters = [
+            Furniture.category_name == category_name,
+            Furniture.country_origin == country,
+        ]
+        if kitchen_type:
+            filters.append(Furniture.subcategory == kitchen_type)
+        return filters
+
+    async def get_furniture_page(self,
+                                 category_name: str,
+                                 country: str,
+                                 kitchen_type: Optional[str] = None,
+                                 after_id: Optional[int] = None,
+                                 limit: int = 10) -> List[Furniture]:
+        """
+        Вернуть одну страницу каталога (keyset-пагинация по Furniture.id).
+        after_id — id последнего показанного товара, None для первой страницы.
+        Фотографии подгружаются сразу для всей страницы одним IN (...) запросом.
+        Результат кешируется по (category_name, country, kitchen_type, after_id).
+        """
+        cache_key = ("page", category_name, country, kitchen_type, after_id, limit)
+        cached, generation = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
         async with self.session() as session:
             try:
-                new_item = Furniture(
-                    description=description,
-                    category_name=category,
-                    country_origin=country,
+                stmt = select(Furniture).where(
+                    *self._catalog_filters(category_name, country, kitchen_type)
                 )
-                session.add(new_item)
-                await session.commit()
-                try:
-                    await session.refresh(new_item)
-                except Exception:
-                    logging.debug("session.refresh failed or not needed for Furniture")
+                if after_id is not None:
+                    stmt = stmt.where(Furniture.id > after_id)
+                stmt = stmt.options(selectinload(Furniture.photos)).order_by(Furniture.id).limit(limit)
 
-                logging.info("Создана мебель: %s (id=%s)", description, getattr(new_item, "id", None))
-                return new_item
+                result = await session.execute(stmt)
+                page = list(result.scalars().all())
 
             except SQLAlchemyError as exc:
-                await session.rollback()
-                logging.exception("DB error in create_furniture: %s", exc)
-                return None
+                logging.exception("DB error in get_furniture_page: %s", exc)
+                return []
 
-            except Exception as exc:
-                await session.rollback()
-                logging.exception("Unexpected error in create_furniture: %s", exc)
-                return None
+        # Неполная страница — хвост выдачи, ее меняет добавление нового товара
+        tags = [furniture_tag(item.id) for item in page]
+        if len(page) < limit:
+            tags.append(catalog_tag(category_name, country, kitchen_type))
+        self._cache_set(cache_key, page, tags, generation)
+        return page
+
+    async def get_furniture_by_categories(self,
+                                          category_names: List[str],
+                                          after_id: Optional[int] = None,
+                                          limit: int = 20) -> List[Furniture]:
+        """
+        Товары из нескольких категорий сразу (любая страна), keyset по Furniture.id — для inline-режима.
+        """
+        if not category_names:
+            return []
+
+        async with self.session() as session:
+            try:
+                stmt = select(Furniture).where(Furniture.category_name.in_(category_names))
+                if after_id is not None:
+                    stmt = stmt.where(Furniture.id > after_id)
+                stmt = stmt.options(selectinload(Furniture.photos)).order_by(Furniture.id).limit(limit)
+
+                result = await session.execute(stmt)
+                return list(result.scalars().all())
+
+            except SQLAlchemyError as exc:
+                logging.exception("DB error in get_furniture_by_categories: %s", exc)
+                return []
+
+    async def get_furniture_before(self,
+                                   category_name: str,
+                                   country: str,
+                                   before_id: int,
+                                   kitchen_type: Optional[str] = None) -> Optional[Furniture]:
+        """
+        Вернуть товар, стоящий в каталоге перед before_id (шаг назад в карусели).
+        Новые товары всегда в конце, поэтому результат меняют только его собственные фото.
+        """
+        cache_key = ("before", category_name, country, kitchen_type, before_id)
+        cached, generation = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
 
-    async def get_furniture_by_category_and_country(self,
-                                                    category_name: str,
-                                                    country: str):
         async with self.session() as session:
             try:
                 stmt = select(Furniture).where(
-                    Furniture.category_name == category_name,
-                    Furniture.country_origin == country
-                ).order_by(Furniture.id)
+                    *self._catalog_filters(category_name, country, kitchen_type),
+                    Furniture.id < before_id
+                ).options(selectinload(Furniture.photos)).order_by(Furniture.id.desc()).limit(1)
+
+                result = await session.execute(stmt)
+                furniture = result.scalar_one_or_none()
+
+            except SQLAlchemyError as exc:
+                logging.exception("DB error in get_furniture_before: %s", exc)
+                return None
+
+        if furniture is not None:
+            self._cache_set(cache_key, furniture, [furniture_tag(furniture.id)], generation)
+        return furniture
+
+    async def count_furniture(self,
+                              category_name: str,
+                              country: str,
+                              kitchen_type: Optional[str] = None) -> int:
+        cache_key = ("count", category_name, country, kitchen_type)
+        cached, generation = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        async with self.session() as session:
+            try:
+                stmt = select(func.count(Furniture.id)).where(
+                    *self._catalog_filters(category_name, country, kitchen_type)
+                )
                 result = await session.execute(stmt)
-                furniture = result.scalars().all()
-                return furniture or None
+                total = result.scalar_one() or 0
 
             except SQLAlchemyError as exc:
-                logging.exception("DB error in get_furniture_by_category_and_country: %s", exc)
+                logging.exception("DB error in count_furniture: %s", exc)
+                return 0
+
+        self._cache_set(cache_key, total, [catalog_tag(category_name, country, kitchen_type)], generation)
+        return total
 
     async def add_photos_to_furniture(self, furniture_id: int, photo_file_ids: List[str]) -> bool:
         if not photo_file_ids:
             return False
 
+        photos = [FurniturePhoto(furniture_id=furniture_id, file_id=file_id) for file_id in photo_file_ids]
+
+        async def write(session):
+            session.add_all(photos)
+            # Пост в канале-хранилище больше не совпадает с карточкой
+            await session.execute(
+                update(Furniture).where(Furniture.id == furniture_id).values(channel_message_ids=None)
+            )
+
+        try:
+            await self.writer.submit(write)
+
+        except SQLAlchemyError as exc:
+            logging.exception("DB error in add_photos_to_furniture: %s", exc)
+            return False
+
+        except Exception as exc:
+            logging.exception("Unexpected error in add_photos_to_furniture: %s", exc)
+            return False
+
+        self.writer.on_commit(lambda: self._invalidate([furniture_tag(furniture_id)]))
+        logging.info("Добавлено %d фотографий к мебели с id=%s", len(photos), furniture_id)
+        return True
+
+    async def get_furniture_by_id(self, furniture_id: int) -> Optional[Furniture]:
         async with self.session() as session:
             try:
-                photos = []
-                for file_id in photo_file_ids:
-                    photo = FurniturePhoto(
-                        furniture_id=furniture_id,
-                        file_id=file_id
-                    )
-                    photos.append(photo)
-
-                session.add_all(photos)
-                await session.commit()
-                logging.info("Добавлено %d фотографий к мебели с id=%s", len(photos), furniture_id)
-                return True
+                stmt = select(Furniture).where(Furniture.id == furniture_id).options(selectinload(Furniture.photos))
+                result = await session.execute(stmt)
+                return result.scalar_one_or_none()
 
             except SQLAlchemyError as exc:
-                await session.rollback()
-                logging.exception("DB error in add_photos_to_furniture: %s", exc)
-                return False
+                logging.exception("DB error in get_furniture_by_id: %s", exc)
+                return None
 
-            except Exception as exc:
-                await session.rollback()
-                logging.exception("Unexpected error in add_photos_to_furniture: %s", exc)
-                return False
+    async def set_channel_messages(self, furniture_id: int, message_ids: List[int]) -> bool:
+        async def write(session):
+            stmt = update(Furniture).where(Furniture.id == furniture_id).values(
+                channel_message_ids=",".join(str(message_id) for message_id in message_ids) or None
+            )
+            result = await session.execute(stmt)
+            return result.rowcount > 0
+
+        try:
+            updated = await self.writer.submit(write)
+
+        except SQLAlchemyError as exc:
+            logging.exception("DB error in set_channel_messages: %s", exc)
+            return False
+
+        self.writer.on_commit(lambda: self._invalidate([furniture_tag(furniture_id)]))
+        return updated
+
+    @staticmethod
+    def _search_terms(query: str) -> List[str]:
+        return [term for term in (query or "").split() if len(term) >= SEARCH_MIN_TERM_LENGTH]
+
+    @staticmethod
+    def build_search_query(query: str) -> Optional[str]:
+        """
+        Превратить пользовательский ввод в запрос FTS5: каждое слово в кавычках
+        (спецсимволы FTS не интерпретируются), слова объединяются через AND.
+        """
+        terms = CrudFurniture._search_terms(query)
+        if not terms:
+            return None
+        return " ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+    @staticmethod
+    def _search_filters(terms: List[str]) -> list:
+        """Поиск без FTS5 (Postgres): все слова должны встречаться в описании, без учета регистра."""
+        return [Furniture.description.icontains(term, autoescape=True) for term in terms]
+
+    async def search_furniture(self, query: str, limit: int = 5, offset: int = 0) -> List[Furniture]:
+        """
+        Полнотекстовый поиск по описаниям (furniture_fts), результаты по убыванию релевантности (bm25).
+        На Postgres — поиск подстрок через ILIKE, новые товары первыми.
+        """
+        match = self.build_search_query(query)
+        if not match:
+            return []
 
-    async def get_furniture_photos(self, furniture_id: int) -> List[FurniturePhoto]:
         async with self.session() as session:
             try:
-                stmt = select(FurniturePhoto).where(FurniturePhoto.furniture_id == furniture_id)
+                if session.bind.dialect.name != "sqlite":
+                    stmt = (
+                        select(Furniture)
+                        .where(*self._search_filters(self._search_terms(query)))
+                        .options(selectinload(Furniture.photos))
+                        .order_by(Furniture.id.desc())
+                        .limit(limit)
+                        .offset(offset)
+                    )
+                    result = await session.execute(stmt)
+                    return list(result.scalars().all())
+
+                ranked = await session.execute(
+                    text("SELECT rowid FROM furniture_fts WHERE furniture_fts MATCH :match "
+                         "ORDER BY rank LIMIT :limit OFFSET :offset"),
+                    {"match": match, "limit": limit, "offset": offset}
+                )
+                ids = [row[0] for row in ranked]
+                if not ids:
+                    return []
+
+                stmt = select(Furniture).where(Furniture.id.in_(ids)).options(selectinload(Furniture.photos))
                 result = await session.execute(stmt)
-                photos = result.scalars().all()
-                return photos or []
+                by_id = {furniture.id: furniture for furniture in result.scalars().all()}
+                return [by_id[furniture_id] for furniture_id in ids if furniture_id in by_id]
 
             except SQLAlchemyError as exc:
-                logging.exception("DB error in get_furniture_photos: %s", exc)
+                logging.exception("DB error in search_furniture: %s", exc)
                 return []
+
+    async def count_search_results(self, query: str) -> int:
+        match = self.build_search_query(query)
+        if not match:
+            return 0
+
+        async with self.session() as session:
+            try:
+                if session.bind.dialect.name != "sqlite":
+                    stmt = select(func.count(Furniture.id)).where(*self._search_filters(self._search_terms(query)))
+                    result = await session.execute(stmt)
+                else:
+                    result = await session.execute(
+                        text("SELECT count(*) FROM furniture_fts WHERE furniture_fts MATCH :match"),
+                        {"match": match}
+                    )
+                return result.scalar_one() or 0
+
+            except SQLAlchemyError as exc:
+                logging.exception("DB error in count_search_results: %s", exc)
+                return 0
@@ -1,23 +1,138 @@
 import os
+
+from sqlalchemy import event
+from sqlalchemy.engine import URL, make_url
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncAttrs
 
+from settings import config
+
 # Формируем абсолютный путь к базе данных
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Корень проекта
 DB_PATH = os.path.join(BASE_DIR, 'database', 'database.db')
 
-# Проверяем, запущены ли мы в Docker
-if os.path.exists('/.dockerenv'):
-    # В Docker используем абсолютный путь
-    DATABASE_URL = f'sqlite+aiosqlite:////app/database/database.db'
-else:
+
+def _with_statement_cache(url: URL) -> URL:
+    if url.get_driver_name() == "asyncpg" and "prepared_statement_cache_size" not in url.query:
+        url = url.update_query_dict({"prepared_statement_cache_size": str(config.DB_STATEMENT_CACHE_SIZE)})
+    return url
+
+
+def _async_url(raw_url: str) -> URL:
+    url = make_url(raw_url)
+    # postgres:// и postgresql:// без драйвера переводим на async-драйвер asyncpg
+    if url.drivername in ("postgres", "postgresql"):
+        url = url.set(drivername="postgresql+asyncpg")
+    return _with_statement_cache(url)
+
+
+def _database_url() -> URL:
+    if config.DATABASE_URL:
+        return _async_url(config.DATABASE_URL)
+
+    # Проверяем, запущены ли мы в Docker
+    if os.path.exists('/.dockerenv'):
+        # В Docker используем абсолютный путь
+        return make_url('sqlite+aiosqlite:////app/database/database.db')
+
     # Локально используем относительный путь
-    DATABASE_URL = f'sqlite+aiosqlite:///{DB_PATH}'
+    return make_url(f'sqlite+aiosqlite:///{DB_PATH}')
+
+
+def _engine_options(url: URL, pool_size: int) -> dict:
+    options = {"echo": config.DB_ECHO}
+
+    if url.get_backend_name() == "sqlite":
+        # SQLite — файл без сервера: пул ограничивает только число одновременных соединений,
+        # recycle и pre_ping ему не нужны. База в памяти живет в одном соединении (StaticPool)
+        if url.database and url.database != ":memory:":
+            options.update(pool_size=pool_size,
+                           max_overflow=config.DB_MAX_OVERFLOW,
+                           pool_timeout=config.DB_POOL_TIMEOUT)
+        return options
+
+    options.update(
+        pool_size=pool_size,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+    )
+    if url.get_driver_name() == "asyncpg":
+        # Собственный кеш asyncpg; кеш SQLAlchemy задается параметром URL prepared_statement_cache_size
+        options["connect_args"] = {"statement_cache_size": config.DB_STATEMENT_CACHE_SIZE}
+    return options
+
+
+DATABASE_URL = _database_url()
+# Чтения можно отправить на реплику; по умолчанию та же база, но отдельный пул
+DATABASE_READ_URL = _async_url(config.DATABASE_READ_URL) if config.DATABASE_READ_URL else DATABASE_URL
+
+# Писатель: все записи идут через очередь (database/write_queue.py) — одного соединения с SQLite достаточно
+if DATABASE_URL.get_backend_name() == "sqlite":
+    async_engine = create_async_engine(
+        DATABASE_URL, pool_size=1, max_overflow=0, pool_timeout=config.DB_POOL_TIMEOUT, echo=config.DB_ECHO
+    )
+else:
+    async_engine = create_async_engine(DATABASE_URL, **_engine_options(DATABASE_URL, config.DB_POOL_SIZE))
+
+# Читатели: отдельный пул, записи через него запрещены
+read_engine = create_async_engine(DATABASE_READ_URL, **_engine_options(DATABASE_READ_URL, config.DB_READ_POOL_SIZE))
+if DATABASE_READ_URL.get_backend_name() == "postgresql":
+    read_engine = read_engine.execution_options(postgresql_readonly=True)
+
+# Профиль PRAGMA для SQLite: порядок важен — journal_mode раньше synchronous
+SQLITE_PRAGMAS = {
+    "journal_mode": config.SQLITE_JOURNAL_MODE,
+    "synchronous": config.SQLITE_SYNCHRONOUS,
+    "busy_timeout": config.SQLITE_BUSY_TIMEOUT,
+    "mmap_size": config.SQLITE_MMAP_SIZE,
+    "cache_size": config.SQLITE_CACHE_SIZE,
+    "temp_store": config.SQLITE_TEMP_STORE,
+}
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record=None) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS.items():
+            if value:
+                cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def _setup_sqlite_writer(dbapi_connection, connection_record=None) -> None:
+    apply_sqlite_pragmas(dbapi_connection, connection_record)
+    # Транзакции открываем сами (см. _begin_immediate): иначе драйвер sqlite3 ломает SAVEPOINT
+    dbapi_connection.isolation_level = None
+
+
+def _begin_immediate(connection) -> None:
+    # Блокировка записи берется сразу, а не при первом UPDATE — без взаимных "database is locked"
+    connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def _setup_sqlite_reader(dbapi_connection, connection_record=None) -> None:
+    apply_sqlite_pragmas(dbapi_connection, connection_record)
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA query_only=1")
+    finally:
+        cursor.close()
+
+
+if DATABASE_URL.get_backend_name() == "sqlite":
+    event.listen(async_engine.sync_engine, "connect", _setup_sqlite_writer)
+    event.listen(async_engine.sync_engine, "begin", _begin_immediate)
+
+if DATABASE_READ_URL.get_backend_name() == "sqlite":
+    event.listen(read_engine.sync_engine, "connect", _setup_sqlite_reader)
 
-async_engine = create_async_engine(DATABASE_URL, echo=False, pool_size=10)
 AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(bind=read_engine, expire_on_commit=False)
 
 
 # Базовый класс для моделей
 class Base(AsyncAttrs, DeclarativeBase):
-    pass
\ No newline at end of file
+    pass
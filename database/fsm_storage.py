@@ -0,0 +1,308 @@
+import asyncio
+import json
+import logging
+import sys
+import time
+from collections import OrderedDict
+from copy import copy
+from datetime import datetime, timedelta
+from typing import Any, Dict, Mapping, Optional
+
+from aiogram.exceptions import DataNotDictLikeError
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, StateType, StorageKey
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from database.engine import AsyncReadSessionLocal
+from database.models import FSMState
+from database.write_queue import write_queue
+from settings import config
+
+
+class _PendingRecord:
+    __slots__ = ("state", "data", "dirty", "version")
+
+    def __init__(self, state: Optional[str], data: Dict[str, Any]):
+        self.state = state
+        self.data = data
+        self.dirty = False
+        self.version = 0
+
+
+class SQLStorage(BaseStorage):
+    """
+    FSM-хранилище в таблице fsm_states на общем async engine.
+
+    Запись откладывается: все set_state/set_data/update_data одного апдейта
+    копятся в памяти и пишутся одним upsert в flush(), который вызывает
+    FSMFlushMiddleware после обработки апдейта. Просроченные состояния
+    удаляются фоновой задачей. Запись идет через общую очередь записей.
+    """
+
+    def __init__(self,
+                 session_maker=AsyncReadSessionLocal,
+                 writer=write_queue,
+                 state_ttl: float = config.FSM_STATE_TTL,
+                 purge_interval: float = config.FSM_PURGE_INTERVAL):
+        self.session = session_maker
+        self.writer = writer
+        self.state_ttl = state_ttl
+        self.purge_interval = purge_interval
+        self.key_builder = DefaultKeyBuilder(with_bot_id=True, with_business_connection_id=True, with_destiny=True)
+        self._records: Dict[str, _PendingRecord] = {}
+        self._purge_task: Optional[asyncio.Task] = None
+
+    async def _load(self, key: StorageKey) -> _PendingRecord:
+        self._ensure_purge_task()
+
+        storage_key = self.key_builder.build(key)
+        record = self._records.get(storage_key)
+        if record is not None:
+            return record
+
+        async with self.session() as session:
+            row = await session.get(FSMState, storage_key)
+
+        # Пока шел запрос, запись могла появиться из другой корутины
+        record = self._records.get(storage_key)
+        if record is None:
+            data = json.loads(row.data) if row is not None and row.data else {}
+            record = _PendingRecord(state=row.state if row is not None else None, data=data)
+            self._records[storage_key] = record
+        return record
+
+    @staticmethod
+    def _mark_dirty(record: _PendingRecord) -> None:
+        record.dirty = True
+        record.version += 1
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        record = await self._load(key)
+        record.state = state.state if isinstance(state, State) else state
+        self._mark_dirty(record)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        record = await self._load(key)
+        return record.state
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        if not isinstance(data, dict):
+            raise DataNotDictLikeError(
+                f"Data must be a dict or dict-like object, got {type(data).__name__}"
+            )
+        record = await self._load(key)
+        record.data = data.copy()
+        self._mark_dirty(record)
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        record = await self._load(key)
+        return record.data.copy()
+
+    async def flush(self, key: Optional[StorageKey] = None) -> None:
+        """
+        Записать накопленные изменения (одного ключа или всех) одной транзакцией
+        и сбросить локальную копию — следующий апдейт прочитает свежие данные из базы.
+        """
+        if key is not None:
+            storage_keys = [self.key_builder.build(key)]
+        else:
+            storage_keys = list(self._records)
+
+        snapshot = []
+        for storage_key in storage_keys:
+            record = self._records.get(storage_key)
+            if record is None:
+                continue
+            if not record.dirty:
+                del self._records[storage_key]
+                continue
+            snapshot.append((storage_key, record.state, dict(record.data), record.version))
+
+        if not snapshot:
+            return
+
+        async def write(session):
+            for storage_key, state, data, _ in snapshot:
+                if state is None and not data:
+                    await session.execute(delete(FSMState).where(FSMState.key == storage_key))
+                else:
+                    await session.execute(self._upsert(session, storage_key, state, data))
+
+        try:
+            await self.writer.submit(write)
+
+        except SQLAlchemyError as exc:
+            logging.exception("DB error in SQLStorage.flush: %s", exc)
+            return
+
+        for storage_key, _, _, version in snapshot:
+            record = self._records.get(storage_key)
+            # Если за время записи пришли новые изменения — оставляем их до следующего flush
+            if record is not None and record.version == version:
+                del self._records[storage_key]
+
+    @staticmethod
+    def _upsert(session, storage_key: str, state: Optional[str], data: Dict[str, Any]):
+        insert = postgresql_insert if session.bind.dialect.name == "postgresql" else sqlite_insert
+        values = {
+            "key": storage_key,
+            "state": state,
+            "data": json.dumps(data, ensure_ascii=False),
+            "updated_at": datetime.now(),
+        }
+        stmt = insert(FSMState).values(**values)
+        return stmt.on_conflict_do_update(
+            index_elements=[FSMState.key],
+            set_={"state": stmt.excluded.state, "data": stmt.excluded.data, "updated_at": stmt.excluded.updated_at}
+        )
+
+    async def purge_expired(self) -> int:
+        expired_before = datetime.now() - timedelta(seconds=self.state_ttl)
+
+        async def write(session):
+            result = await session.execute(delete(FSMState).where(FSMState.updated_at < expired_before))
+            return result.rowcount
+
+        try:
+            return await self.writer.submit(write)
+
+        except SQLAlchemyError as exc:
+            logging.exception("DB error in SQLStorage.purge_expired: %s", exc)
+            return 0
+
+    def _ensure_purge_task(self) -> None:
+        if self._purge_task is None or self._purge_task.done():
+            self._purge_task = asyncio.create_task(self._purge_loop())
+
+    async def _purge_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.purge_interval)
+            removed = await self.purge_expired()
+            if removed:
+                logging.info("Удалено %d просроченных FSM-состояний", removed)
+
+    async def close(self) -> None:
+        await self.flush()
+        if self._purge_task is not None:
+            self._purge_task.cancel()
+            self._purge_task = None
+
+
+def _approx_size(obj: Any) -> int:
+    """Приблизительный размер объекта в байтах вместе с вложенными коллекциями."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_approx_size(key) + _approx_size(value) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_approx_size(item) for item in obj)
+    return size
+
+
+class _MemoryRecord:
+    __slots__ = ("state", "data", "touched_at", "size")
+
+    def __init__(self):
+        self.state: Optional[str] = None
+        self.data: Dict[str, Any] = {}
+        self.touched_at = 0.0
+        self.size = 0
+
+
+class BoundedMemoryStorage(BaseStorage):
+    """
+    In-memory FSM-хранилище с ограниченной емкостью: не больше capacity чатов,
+    записи без активности дольше idle_ttl удаляются, самые давние вытесняются
+    первыми. Пустые записи (после state.clear()) не хранятся вовсе.
+    """
+
+    def __init__(self,
+                 capacity: int = config.FSM_MEMORY_CAPACITY,
+                 idle_ttl: float = config.FSM_STATE_TTL):
+        self.capacity = capacity
+        self.idle_ttl = idle_ttl
+        # Порядок — по времени последнего обращения, самые давние в начале
+        self._records: "OrderedDict[StorageKey, _MemoryRecord]" = OrderedDict()
+        self._total_size = 0
+        self.evicted = 0
+
+    def _evict_expired(self, now: float) -> None:
+        while self._records:
+            key, record = next(iter(self._records.items()))
+            if now - record.touched_at <= self.idle_ttl:
+                break
+            self._drop(key)
+            self.evicted += 1
+
+    def _drop(self, key: StorageKey) -> None:
+        record = self._records.pop(key, None)
+        if record is not None:
+            self._total_size -= record.size
+
+    def _get(self, key: StorageKey) -> Optional[_MemoryRecord]:
+        now = time.monotonic()
+        self._evict_expired(now)
+
+        record = self._records.get(key)
+        if record is not None:
+            record.touched_at = now
+            self._records.move_to_end(key)
+        return record
+
+    def _write(self, key: StorageKey, state: Optional[str], data: Dict[str, Any]) -> None:
+        if state is None and not data:
+            self._drop(key)
+            return
+
+        record = self._get(key)
+        if record is None:
+            record = _MemoryRecord()
+            record.touched_at = time.monotonic()
+            self._records[key] = record
+            while len(self._records) > self.capacity:
+                self._drop(next(iter(self._records)))
+                self.evicted += 1
+
+        self._total_size -= record.size
+        record.state = state
+        record.data = data
+        record.size = sys.getsizeof(record) + _approx_size(key) + _approx_size(state) + _approx_size(data)
+        self._total_size += record.size
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        record = self._get(key)
+        self._write(key, state.state if isinstance(state, State) else state, record.data if record else {})
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        record = self._get(key)
+        return record.state if record else None
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        if not isinstance(data, dict):
+            raise DataNotDictLikeError(
+                f"Data must be a dict or dict-like object, got {type(data).__name__}"
+            )
+        record = self._get(key)
+        self._write(key, record.state if record else None, data.copy())
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        record = self._get(key)
+        return record.data.copy() if record else {}
+
+    async def get_value(self, storage_key: StorageKey, dict_key: str, default: Optional[Any] = None) -> Optional[Any]:
+        record = self._get(storage_key)
+        return copy(record.data.get(dict_key, default)) if record else default
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._records),
+            "capacity": self.capacity,
+            "approx_bytes": self._total_size,
+            "evicted": self.evicted,
+        }
+
+    async def close(self) -> None:
+        self._records.clear()
+        self._total_size = 0
@@ -1,17 +1,20 @@
 from datetime import datetime, timezone, timedelta
 from uuid import uuid4
 
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime, Boolean, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 
 from .engine import Base
 
+# telegram_id не помещаются в 32 бита: в Postgres это BIGINT, в SQLite INTEGER и так 64-битный
+TelegramId = BigInteger().with_variant(Integer(), "sqlite")
+
 
 class User(Base):
     __tablename__ = 'users'
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid4()))
-    telegram_id = Column(Integer, unique=True, nullable=False, index=True)
+    telegram_id = Column(TelegramId, unique=True, nullable=False, index=True)
     username = Column(String, nullable=True)
     firstname = Column(String, nullable=True)
     lastname = Column(String, nullable=True)
@@ -23,7 +26,7 @@ class Category(Base):
     __tablename__ = 'categories'
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, nullable=False)
+    name = Column(String, nullable=False, unique=True, index=True)
     description = Column(Text, nullable=True)
     created_at = Column(DateTime, default=lambda: datetime.now())
 
@@ -38,10 +41,19 @@ class Furniture(Base):
     description = Column(Text, nullable=True)
     category_name = Column(String, ForeignKey('categories.name'), nullable=False)
     country_origin = Column(String, nullable=True)  # Страна производства (RU, TR)
+    subcategory = Column(String, nullable=True)  # Подкатегория, например тип кухни
+    channel_message_ids = Column(String, nullable=True)  # id сообщений карточки в канале-хранилище, через запятую
     created_at = Column(DateTime, default=lambda: datetime.now())
 
     # Связь с фотографиями
-    photos = relationship("FurniturePhoto", back_populates="furniture", cascade="all, delete-orphan")
+    photos = relationship("FurniturePhoto", back_populates="furniture", cascade="all, delete-orphan",
+                          order_by="FurniturePhoto.id")
+
+    # Индексы под keyset-пагинацию каталога: WHERE category/country[/subcategory] AND id > ? ORDER BY id
+    __table_args__ = (
+        Index('ix_furniture_catalog', 'category_name', 'country_origin', 'id'),
+        Index('ix_furniture_catalog_subcategory', 'category_name', 'country_origin', 'subcategory', 'id'),
+    )
 
 
 class FurniturePhoto(Base):
@@ -56,15 +68,46 @@ class FurniturePhoto(Base):
     # Связь с мебелью
     furniture = relationship("Furniture", back_populates="photos")
 
+    __table_args__ = (
+        Index('ix_furniture_photos_furniture_id', 'furniture_id', 'id'),
+    )
+
+
+def moscow_now() -> datetime:
+    # Московское время без tzinfo: колонка TIMESTAMP WITHOUT TIME ZONE, asyncpg не принимает aware-datetime
+    return datetime.now(timezone(timedelta(hours=3))).replace(tzinfo=None)
+
+
+# Статусы заявки на сотрудничество: обработанные заявки остаются в базе как история
+COOPERATION_NEW = 'new'
+COOPERATION_ACCEPTED = 'accepted'
+COOPERATION_REJECTED = 'rejected'
+
 
 class Cooperation(Base):
     __tablename__ = 'cooperation_requests'
 
     id = Column(Integer, primary_key=True)
-    telegram_id = Column(Integer, ForeignKey('users.telegram_id'), nullable=False)
+    telegram_id = Column(TelegramId, ForeignKey('users.telegram_id'), nullable=False)
     username = Column(String, nullable=False)
     text_requests = Column(String, nullable=False)
-    request_created_at = Column(DateTime, default=lambda: datetime.now(timezone(timedelta(hours=3))))
+    request_created_at = Column(DateTime, default=moscow_now)
+    status = Column(String(16), nullable=False, default=COOPERATION_NEW, server_default=COOPERATION_NEW)
+    reviewed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Входящие — новые заявки по порядку id: и страница, и счетчик читаются по индексу
+        Index('ix_cooperation_requests_status_id', 'status', 'id'),
+    )
 
     def __repr__(self):
         return f'{self.id} | {self.telegram_id} | {self.username} | {self.telegram_id} | {self.request_created_at}'
+
+
+class FSMState(Base):
+    __tablename__ = 'fsm_states'
+
+    key = Column(String, primary_key=True)  # Ключ StorageKey, собранный DefaultKeyBuilder
+    state = Column(String, nullable=True)
+    data = Column(Text, nullable=True)  # JSON
+    updated_at = Column(DateTime, default=lambda: datetime.now(), nullable=False, index=True)
@@ -0,0 +1,117 @@
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.engine import AsyncReadSessionLocal
+from database.write_queue import WriteOperation, T, write_queue
+
+_current: ContextVar[Optional["UnitOfWork"]] = ContextVar("current_unit_of_work", default=None)
+
+
+def current_unit_of_work() -> Optional["UnitOfWork"]:
+    """
+    UnitOfWork текущего апдейта или None вне UnitOfWorkMiddleware.
+    Фоновые задачи, запущенные из хендлера, работают вне транзакции апдейта:
+    одну AsyncSession нельзя использовать из нескольких задач сразу.
+    """
+    uow = _current.get()
+    if uow is not None and uow.owned():
+        return uow
+    return None
+
+
+class UnitOfWork:
+    """
+    Контекст апдейта для CRUD-классов.
+
+    Вне транзакции каждое чтение идет короткой сессией пула только для чтения
+    (соединение возвращается в пул сразу после запроса), а каждая запись — через
+    write_queue и фиксируется сразу.
+
+    Записи, которые должны примениться вместе, оборачиваются в
+    `async with uow.transaction():` — одна пишущая транзакция, COMMIT на выходе
+    из блока, ROLLBACK при исключении; чтения внутри блока видят свои записи
+    и идут мимо кеша каталога, on_commit (сброс кешей) выполняются после COMMIT. В SQLite блок держит
+    единственного писателя, поэтому внутри — только работа с базой: сообщения
+    в Telegram отправляются после блока.
+    """
+
+    def __init__(self, read_session_maker=AsyncReadSessionLocal, writer=write_queue):
+        self._read_session_maker = read_session_maker
+        self._writer = writer
+        self._write_session: Optional[AsyncSession] = None
+        self._on_commit: List[Callable[[], Any]] = []
+        self._token = None
+        self._task: Optional[asyncio.Task] = None
+
+    def __enter__(self) -> "UnitOfWork":
+        self._task = asyncio.current_task()
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        _current.reset(self._token)
+
+    def owned(self) -> bool:
+        return self._task is asyncio.current_task()
+
+    def in_transaction(self) -> bool:
+        return self._write_session is not None and self.owned()
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        """Замена sessionmaker для чтений: внутри transaction() — пишущая сессия блока."""
+        if self.in_transaction():
+            yield self._write_session
+            return
+
+        async with self._read_session_maker() as session:
+            yield session
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator["UnitOfWork"]:
+        """
+        Одна пишущая транзакция на блок. Вложенный блок — SAVEPOINT внешнего.
+
+        Записи из дочерних задач (asyncio.gather, create_task) в блок не попадают —
+        они идут в write_queue, которую в SQLite этот блок и держит. Поэтому внутри
+        блока записи выполняются последовательно, а не через gather.
+        """
+        if not self.owned():
+            raise RuntimeError("UnitOfWork.transaction() можно открыть только из задачи апдейта")
+
+        if self._write_session is not None:
+            async with self._write_session.begin_nested():
+                yield self
+            return
+
+        session = await self._writer.acquire()
+        self._write_session = session
+        committed = False
+        try:
+            yield self
+            committed = True
+        finally:
+            self._write_session = None
+            callbacks, self._on_commit = self._on_commit, []
+            await self._writer.release(session, commit=committed)
+
+        for callback in callbacks:
+            callback()
+
+    async def submit(self, operation: WriteOperation) -> T:
+        """Та же сигнатура, что у WriteQueue.submit; внутри transaction() операция идет в ее SAVEPOINT."""
+        if not self.in_transaction():
+            return await self._writer.submit(operation)
+
+        async with self._write_session.begin_nested():
+            return await operation(self._write_session)
+
+    def on_commit(self, callback: Callable[[], Any]) -> None:
+        if self.in_transaction():
+            self._on_commit.append(callback)
+        else:
+            callback()
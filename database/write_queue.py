@@ -0,0 +1,188 @@
+import asyncio
+import logging
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.engine import AsyncSessionLocal
+from settings import config
+
+T = TypeVar("T")
+WriteOperation = Callable[[AsyncSession], Awaitable[T]]
+
+# Пишущая сессия, захваченная задачей (UnitOfWork.transaction): записи из этой задачи выполняются сразу в ней.
+# Хранится вместе с задачей-владельцем — задачи, созданные внутри, наследуют контекст, но не сессию
+_active_session: ContextVar[Optional[Tuple[asyncio.Task, AsyncSession]]] = ContextVar(
+    "write_queue_active_session", default=None
+)
+
+
+class WriteQueue:
+    """
+    Единственный писатель в базу. CRUD-классы не открывают пишущие сессии сами,
+    а ставят операцию в очередь; фоновая задача забирает все, что накопилось,
+    и выполняет пачкой в одной транзакции — один BEGIN IMMEDIATE и один COMMIT
+    на пачку вместо блокировки файла SQLite на каждую запись.
+
+    Каждая операция выполняется в своем SAVEPOINT: ошибка одной операции
+    (например, IntegrityError) откатывает только ее и возвращается вызвавшему,
+    остальные операции пачки фиксируются.
+
+    Транзакцию из нескольких записей (UnitOfWork.transaction) можно захватить через
+    acquire()/release(): в SQLite на это время пачки очереди ждут, в Postgres транзакция
+    идет параллельно. Держать ее стоит только на время запросов к базе.
+    """
+
+    def __init__(self,
+                 session_maker=AsyncSessionLocal,
+                 max_batch: int = config.WRITE_BATCH_SIZE,
+                 max_delay: float = config.WRITE_BATCH_DELAY):
+        self.session = session_maker
+        self.max_batch = max(1, max_batch)
+        self.max_delay = max_delay
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self.batches = 0
+        self.writes = 0
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._lock = asyncio.Lock()
+            self._worker = loop.create_task(self._run())
+
+    @property
+    def _exclusive(self) -> bool:
+        # SQLite допускает одного писателя на файл, Postgres — нет
+        return self.session.kw["bind"].dialect.name == "sqlite"
+
+    async def submit(self, operation: WriteOperation) -> T:
+        """
+        Выполнить operation(session) в пишущей транзакции и вернуть ее результат
+        после COMMIT. Исключение операции или коммита пробрасывается вызвавшему.
+        """
+        active = _active_session.get()
+        if active is not None:
+            owner, session = active
+            if owner is asyncio.current_task():
+                # Транзакция уже захвачена этим апдейтом — очередь ждет ее, поэтому пишем сразу
+                async with session.begin_nested():
+                    return await operation(session)
+            if self._exclusive and session.in_transaction():
+                # Дочерняя задача транзакции: очередь ждет блокировку, которую держит родитель,
+                # а родитель ждет эту задачу — вместо вечного ожидания сообщаем об ошибке
+                raise RuntimeError("Запись из дочерней задачи внутри UnitOfWork.transaction() "
+                                   "в SQLite приведет к взаимной блокировке — выполняйте ее в самой транзакции")
+
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((operation, future))
+        return await future
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self.queue_depth,
+            "batches": self.batches,
+            "writes": self.writes,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            if self.max_delay > 0:
+                await asyncio.sleep(self.max_delay)
+            # Пока шла предыдущая транзакция, очередь могла пополниться — забираем все сразу
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            try:
+                await self._execute(batch)
+            except Exception as exc:
+                logging.exception("Ошибка в очереди записей: %s", exc)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def on_commit(self, callback: Callable[[], Any]) -> None:
+        # submit() возвращается уже после COMMIT
+        callback()
+
+    async def acquire(self) -> AsyncSession:
+        """
+        Открыть пишущую транзакцию для вызывающего кода. Пока она не закрыта через
+        release(), submit() из того же контекста выполняется в ней.
+        """
+        self._ensure_worker()
+        if self._exclusive:
+            await self._lock.acquire()
+        try:
+            session = self.session()
+            await session.begin()
+        except BaseException:
+            if self._exclusive:
+                self._lock.release()
+            raise
+        _active_session.set((asyncio.current_task(), session))
+        return session
+
+    async def release(self, session: AsyncSession, commit: bool) -> None:
+        _active_session.set(None)
+        try:
+            if commit:
+                await session.commit()
+            else:
+                await session.rollback()
+        finally:
+            await session.close()
+            if self._exclusive:
+                self._lock.release()
+
+    async def _execute(self, batch: List[Tuple[WriteOperation, asyncio.Future]]) -> None:
+        outcomes: List[Tuple[asyncio.Future, Optional[BaseException], Any]] = []
+
+        async with self._lock if self._exclusive else nullcontext(), self.session() as session:
+            async with session.begin():
+                for operation, future in batch:
+                    if future.cancelled():
+                        continue
+                    try:
+                        async with session.begin_nested():
+                            result = await operation(session)
+                    except Exception as exc:
+                        outcomes.append((future, exc, None))
+                    else:
+                        outcomes.append((future, None, result))
+
+        # Результаты отдаем только после COMMIT: вызвавший может сразу сбрасывать кеши
+        self.batches += 1
+        self.writes += len(outcomes)
+        for future, exc, result in outcomes:
+            if future.done():
+                continue
+            if exc is not None:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+    async def close(self) -> None:
+        """Дождаться записи всего, что уже в очереди, и остановить фоновую задачу."""
+        if self._worker is None or self._worker.done():
+            return
+        if self._worker.get_loop() is asyncio.get_running_loop():
+            await self._queue.join()
+        self._worker.cancel()
+        self._worker = None
+
+
+write_queue = WriteQueue()
@@ -1,8 +1,13 @@
 from aiogram import Router
 
+from middlewares import AdminMiddleware
 
 router = Router()
 
+# Все вложенные админские роутеры доступны только администраторам
+router.message.middleware(AdminMiddleware())
+router.callback_query.middleware(AdminMiddleware())
+
 from .main_admin import router as main_admin_router
 router.include_router(main_admin_router)
 
@@ -16,4 +21,10 @@ from .list_categories_furniture_handler import router as list_categories_furnitu
 router.include_router(list_categories_furniture_router)
 
 from .new_furniture_handler import router as new_furniture_router
-router.include_router(new_furniture_router)
\ No newline at end of file
+router.include_router(new_furniture_router)
+
+from .import_catalog_handler import router as import_catalog_router
+router.include_router(import_catalog_router)
+
+from .export_catalog_handler import router as export_catalog_router
+router.include_router(export_catalog_router)
@@ -0,0 +1,86 @@
+import asyncio
+import logging
+import os
+import tempfile
+import zipfile
+
+from aiogram import Router, F, types
+
+from keyboard.button_template import export_catalog_kb
+from keyboard.keyboard_builder import make_row_inline_keyboards
+from utils.catalog_export import backup_database, export_tables, is_sqlite, timestamp
+
+router = Router()
+
+UPLOAD_LIMIT = 50 * 1024 * 1024  # лимит Bot API на отправку файла
+
+
+def _compress(path: str, archive_path: str, name: str) -> None:
+    with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.write(path, arcname=name)
+
+
+async def _send_file(message: types.Message, path: str, caption: str) -> None:
+    size = os.path.getsize(path)
+    if size > UPLOAD_LIMIT:
+        await message.answer("⚠️ <b>Файл слишком большой для Telegram</b>\n\n"
+                             f"Размер: {size // (1024 * 1024)} МБ. "
+                             "Запустите на сервере <code>python -m utils.catalog_export</code>.")
+        return
+    await message.answer_document(types.FSInputFile(path), caption=caption)
+
+
+@router.callback_query(F.data == 'export_catalog')
+async def export_catalog_callback(callback_query: types.CallbackQuery):
+    await callback_query.answer()
+
+    text = (
+        "📤 <b>Экспорт и резервная копия</b>\n\n"
+        "• <b>Таблицы</b> — архив с категориями, мебелью, фото, пользователями и заявками\n"
+        "• <b>Копия базы</b> — снимок файла SQLite, бот при этом продолжает работать\n\n"
+        "Выберите действие:"
+    )
+    await callback_query.message.answer(text, reply_markup=make_row_inline_keyboards(export_catalog_kb))
+
+
+@router.callback_query(F.data.in_({'export_catalog_jsonl', 'export_catalog_csv'}))
+async def export_tables_callback(callback_query: types.CallbackQuery):
+    await callback_query.answer("⏳ Готовлю выгрузку…")
+    fmt = callback_query.data.rsplit("_", 1)[-1]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, f"catalog-{timestamp()}-{fmt}.zip")
+        try:
+            counts = await export_tables(path, fmt)
+        except Exception as exc:
+            logging.exception("Ошибка выгрузки таблиц: %s", exc)
+            await callback_query.message.answer("❌ Не удалось выгрузить таблицы. Подробности в логах.")
+            return
+
+        caption = "📤 Выгрузка таблиц\n\n" + "\n".join(f"• {table}: {rows}" for table, rows in counts.items())
+        await _send_file(callback_query.message, path, caption)
+
+
+@router.callback_query(F.data == 'backup_database')
+async def backup_database_callback(callback_query: types.CallbackQuery):
+    if not is_sqlite():
+        await callback_query.answer("Копия доступна только для SQLite — для Postgres используйте pg_dump",
+                                    show_alert=True)
+        return
+
+    await callback_query.answer("⏳ Делаю копию базы…")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        name = f"database-{timestamp()}.db"
+        backup_path = os.path.join(tmp_dir, name)
+        archive_path = f"{backup_path}.zip"
+        try:
+            await backup_database(backup_path)
+            # Файл базы хорошо сжимается — так он чаще укладывается в лимит Telegram
+            await asyncio.to_thread(_compress, backup_path, archive_path, name)
+        except Exception as exc:
+            logging.exception("Ошибка резервного копирования базы: %s", exc)
+            await callback_query.message.answer("❌ Не удалось сделать копию базы. Подробности в логах.")
+            return
+
+        await _send_file(callback_query.message, archive_path, f"💾 Резервная копия базы\n{name}")
@@ -0,0 +1,306 @@
+import asyncio
+import html
+import logging
+import os
+import tempfile
+import time
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from aiogram import Bot, Router, F, types
+from aiogram.exceptions import TelegramAPIError, TelegramBadRequest
+from aiogram.fsm.context import FSMContext
+
+from database.crud import CrudCategory, CrudFurniture
+from handlers.backend.furniture_handlers.furniture_card import MAX_ALBUM_PHOTOS
+from keyboard.button_template import cancel_import_kb, country_kb, kitchen_subcategory_kb
+from keyboard.keyboard_builder import make_row_inline_keyboards
+from settings import config
+from states.states import ImportCatalogStates
+from utils.catalog_import import (
+    SUPPORTED_EXTENSIONS, CatalogSource, ImportRow, RowError, RowValidator, photo_kind
+)
+
+router = Router()
+
+# Запущенные импорты по чатам: храним ссылку на задачу, иначе ее может собрать GC
+_imports: Dict[int, asyncio.Task] = {}
+
+PROGRESS_INTERVAL = 2.0  # не чаще одного редактирования сообщения о ходе импорта
+REPORT_ERRORS_LIMIT = 10
+
+
+@router.callback_query(F.data == 'import_catalog')
+async def import_catalog_callback(callback_query: types.CallbackQuery, state: FSMContext):
+    await callback_query.answer()
+    await state.clear()
+
+    text = (
+        "📥 <b>Импорт каталога</b>\n\n"
+        "Отправьте файл <b>.csv</b>, <b>.jsonl</b> или <b>.zip</b> (таблица и фотографии).\n\n"
+        "Колонки: <code>description</code>, <code>category</code>, <code>country</code>, "
+        "<code>subcategory</code> (тип кухни), <code>photos</code>.\n"
+        "В <code>photos</code> — file_id, ссылки или имена файлов из архива через «|».\n\n"
+        f"• Категория должна уже существовать\n"
+        f"• Не более {MAX_ALBUM_PHOTOS} фото на товар\n"
+        f"• Размер файла — до {config.IMPORT_MAX_FILE_SIZE // (1024 * 1024)} МБ\n\n"
+        "<i>Пример строки CSV:</i>\n"
+        "<code>description;category;country;photos\n"
+        "Диван \"Комфорт\", 200×90×85 см;🛋️ Мягкая мебель;🇹🇷 Турция;sofa1.jpg|sofa2.jpg</code>"
+    )
+
+    await callback_query.message.answer(text, reply_markup=make_row_inline_keyboards(cancel_import_kb))
+    await state.set_state(ImportCatalogStates.file)
+
+
+@router.callback_query(F.data == 'cancel_import')
+async def cancel_import_callback(callback_query: types.CallbackQuery, state: FSMContext):
+    await callback_query.answer("Операция отменена ✖️")
+    await state.clear()
+    await callback_query.message.answer("Импорт каталога отменен.")
+
+
+@router.message(ImportCatalogStates.file, F.document)
+async def get_import_file(message: types.Message, state: FSMContext):
+    document = message.document
+    filename = document.file_name or ""
+
+    if not filename.lower().endswith(SUPPORTED_EXTENSIONS):
+        await message.answer("⚠️ <b>Неподдерживаемый формат</b>\n\n"
+                             "Пожалуйста, отправьте файл .csv, .jsonl или .zip.")
+        return
+
+    if document.file_size and document.file_size > config.IMPORT_MAX_FILE_SIZE:
+        await message.answer("⚠️ <b>Файл слишком большой</b>\n\n"
+                             f"Максимальный размер — {config.IMPORT_MAX_FILE_SIZE // (1024 * 1024)} МБ. "
+                             "Разбейте каталог на несколько файлов.")
+        return
+
+    chat_id = message.chat.id
+    running = _imports.get(chat_id)
+    if running is not None and not running.done():
+        await message.answer("⏳ Предыдущий импорт еще выполняется. Дождитесь отчета.")
+        return
+
+    await state.clear()
+    progress = await message.answer(f"⏳ <b>Импорт запущен</b>\n\nФайл: {html.escape(filename)}")
+
+    # Импорт идет в фоне: апдейт завершается сразу, а товары пишутся пачками через очередь записей
+    task = asyncio.create_task(run_import(message.bot, chat_id, progress.message_id, document.file_id, filename))
+    _imports[chat_id] = task
+    task.add_done_callback(lambda done: _imports.pop(chat_id) if _imports.get(chat_id) is done else None)
+
+
+@router.message(ImportCatalogStates.file)
+async def get_import_file_invalid(message: types.Message):
+    await message.answer("📎 Отправьте файл .csv, .jsonl или .zip документом или нажмите «Отменить».")
+
+
+class _ImportProgress:
+    """Счетчики импорта и редкое обновление сообщения о ходе."""
+
+    def __init__(self, bot: Bot, chat_id: int, message_id: int, filename: str):
+        self.bot = bot
+        self.chat_id = chat_id
+        self.message_id = message_id
+        self.filename = filename
+        self.processed = 0
+        self.imported = 0
+        self.skipped = 0
+        self.errors: List[RowError] = []
+        self._updated_at = time.monotonic()
+
+    async def edit(self, text: str) -> None:
+        try:
+            await self.bot.edit_message_text(text=text, chat_id=self.chat_id, message_id=self.message_id)
+        except TelegramBadRequest:
+            # "message is not modified" или сообщение удалено — импорт это не останавливает
+            pass
+
+    async def tick(self) -> None:
+        if time.monotonic() - self._updated_at < PROGRESS_INTERVAL:
+            return
+        self._updated_at = time.monotonic()
+        await self.edit(
+            f"⏳ <b>Импорт идет</b>\n\n"
+            f"Файл: {html.escape(self.filename)}\n"
+            f"• Обработано строк: {self.processed}\n"
+            f"• Добавлено: {self.imported}\n"
+            f"• Пропущено: {self.skipped}"
+        )
+
+    def report(self) -> str:
+        text = (
+            "✅ <b>Импорт завершен</b>\n\n"
+            f"Файл: {html.escape(self.filename)}\n"
+            f"• Обработано строк: {self.processed}\n"
+            f"• Добавлено: {self.imported}\n"
+            f"• Пропущено: {self.skipped}\n"
+            f"• Замечаний: {len(self.errors)}"
+        )
+        if self.errors:
+            lines = [
+                f"• строка {error.line}: {html.escape(error.message)}"
+                for error in self.errors[:REPORT_ERRORS_LIMIT]
+            ]
+            text += "\n\n⚠️ <b>Замечания:</b>\n" + "\n".join(lines)
+            if len(self.errors) > REPORT_ERRORS_LIMIT:
+                text += "\n…полный список — в файле ниже."
+        return text
+
+
+async def _upload_photo(bot: Bot, target_chat_id: int, source: CatalogSource, reference: str) -> str:
+    """
+    Получить file_id фотографии. Ссылку и файл из архива загружаем в Telegram
+    (в канал-хранилище или чат админа) и сразу удаляем служебное сообщение.
+    """
+    kind = photo_kind(reference)
+    if kind == "file_id":
+        return reference
+
+    if kind == "file":
+        data = await asyncio.to_thread(source.read_image, reference)
+        if data is None:
+            raise ValueError(f"{reference}: нет в архиве")
+        photo = types.BufferedInputFile(data, filename=os.path.basename(reference))
+    else:
+        # Ссылку Telegram скачивает сам
+        photo = reference
+
+    sent = await bot.send_photo(target_chat_id, photo, disable_notification=True)
+    try:
+        await bot.delete_message(target_chat_id, sent.message_id)
+    except TelegramAPIError:
+        pass
+    return sent.photo[-1].file_id
+
+
+async def _resolve_photos(bot: Bot,
+                          target_chat_id: int,
+                          source: CatalogSource,
+                          row: ImportRow,
+                          progress: _ImportProgress) -> ImportRow:
+    photos = []
+    for reference in row.photos:
+        try:
+            photos.append(await _upload_photo(bot, target_chat_id, source, reference))
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            # Товар сохраняем и без этого фото, в отчете будет замечание
+            message = str(exc) if isinstance(exc, ValueError) else f"{reference}: {exc}"
+            progress.errors.append(RowError(row.line, f"фото не загружено — {message}"))
+    return row._replace(photos=photos)
+
+
+async def _import_batch(bot: Bot,
+                        target_chat_id: int,
+                        source: CatalogSource,
+                        batch: List[ImportRow],
+                        progress: _ImportProgress) -> None:
+    # Все фото уходят в один чат, а его лимит OutboundScheduler все равно соблюдает по одной
+    # отправке — параллельная загрузка не быстрее, зато держала бы в памяти все фото пачки
+    rows = [await _resolve_photos(bot, target_chat_id, source, row, progress) for row in batch]
+
+    ids = await CrudFurniture().bulk_create_furniture([
+        {
+            "description": row.description,
+            "category_name": row.category,
+            "country_origin": row.country,
+            "subcategory": row.subcategory,
+            "photos": row.photos,
+        }
+        for row in rows
+    ])
+    if ids is None:
+        progress.skipped += len(rows)
+        progress.errors.append(RowError(rows[0].line, f"ошибка базы данных, строки {rows[0].line}–{rows[-1].line} "
+                                                      f"не добавлены"))
+    else:
+        progress.imported += len(ids)
+
+
+def _read_records(records: Iterator[Tuple[int, dict]], count: int) -> List[Tuple[int, dict]]:
+    return list(islice(records, count))
+
+
+async def run_import(bot: Bot,
+                     chat_id: int,
+                     progress_message_id: int,
+                     file_id: str,
+                     filename: str,
+                     target_chat_id: Optional[int] = None) -> None:
+    """
+    Скачать файл, проверить строки и добавить товары пачками по IMPORT_BATCH_SIZE.
+    Файл читается в отдельном потоке, чтобы разбор и распаковка не останавливали бота.
+    """
+    progress = _ImportProgress(bot, chat_id, progress_message_id, filename)
+    target_chat_id = target_chat_id or config.CATALOG_CHANNEL_ID or chat_id
+    batch_size = max(1, config.IMPORT_BATCH_SIZE)
+
+    try:
+        categories = await CrudCategory().get_all_categories() or []
+        validator = RowValidator(
+            categories=[category.name for category in categories],
+            countries=country_kb,
+            kitchen_types=kitchen_subcategory_kb,
+            max_photos=MAX_ALBUM_PHOTOS,
+            default_country="🇷🇺 Россия",
+        )
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, os.path.basename(filename))
+            await bot.download(file_id, destination=path)
+
+            with CatalogSource(path, filename) as source:
+                records = source.records()
+                batch: List[ImportRow] = []
+                while True:
+                    chunk = await asyncio.to_thread(_read_records, records, batch_size)
+                    if not chunk:
+                        break
+
+                    for line, record in chunk:
+                        progress.processed += 1
+                        row, errors = validator.validate(line, record)
+                        progress.errors.extend(errors)
+                        if row is None:
+                            progress.skipped += 1
+                            continue
+
+                        batch.append(row)
+                        if len(batch) >= batch_size:
+                            await _import_batch(bot, target_chat_id, source, batch, progress)
+                            batch = []
+                            await progress.tick()
+
+                if batch:
+                    await _import_batch(bot, target_chat_id, source, batch, progress)
+
+    except asyncio.CancelledError:
+        raise
+
+    except Exception as exc:
+        logging.exception("Ошибка импорта каталога из %s: %s", filename, exc)
+        await progress.edit(
+            "❌ <b>Импорт прерван</b>\n\n"
+            f"Файл: {html.escape(filename)}\n"
+            f"Причина: {html.escape(str(exc))}\n\n"
+            f"До ошибки добавлено: {progress.imported}"
+        )
+        return
+
+    logging.info("Импорт каталога из %s: добавлено %d, пропущено %d, замечаний %d",
+                 filename, progress.imported, progress.skipped, len(progress.errors))
+    await progress.edit(progress.report())
+
+    if progress.errors:
+        errors_text = "\n".join(f"строка {error.line}: {error.message}" for error in progress.errors)
+        try:
+            await bot.send_document(
+                chat_id,
+                types.BufferedInputFile(errors_text.encode("utf-8"), filename="errors.txt"),
+                caption="📄 Замечания импорта",
+            )
+        except TelegramAPIError as exc:
+            logging.warning("Не удалось отправить отчет импорта: %s", exc)
@@ -1,13 +1,30 @@
+import logging
+from typing import List, Optional
+
 from aiogram import Router, F, types
 from aiogram.fsm.context import FSMContext
 
 from database.crud import CrudCategory, CrudFurniture
+from database.unit_of_work import UnitOfWork
+from handlers.backend.furniture_handlers.furniture_card import (
+    MAX_ALBUM_PHOTOS, publish_card_to_channel, render_furniture_card
+)
 from keyboard.button_template import country_kb, kitchen_subcategory_kb, more_added_furniture
 from keyboard.keyboard_builder import make_row_keyboards, make_row_inline_keyboards
+from middlewares import MediaGroupMiddleware
+from settings import config
 from states.states import NewFurnitureStates
 
+
+class FurnitureNotSaved(Exception):
+    """Мебель или ее фото не записались — блок uow.transaction() откатывается целиком."""
+
+
 router = Router()
 
+# Альбом фотографий приходит в get_photos одним вызовом (album), а не десятью параллельными
+router.message.middleware(MediaGroupMiddleware())
+
 
 @router.callback_query(F.data == 'new_furniture')
 async def new_furniture_function(callback_query: types.CallbackQuery, state: FSMContext):
@@ -114,7 +131,7 @@ async def get_kitchen_type(message: types.Message, state: FSMContext):
         f"Теперь отправьте <b>фотографии</b> мебели 📸\n"
         f"• Вы можете отправить несколько фотографий (не более 10)\n"
         f"• Рекомендуется отправлять фото с разных ракурсов\n"
-        f"• Каждое фото будет добавлено отдельно\n\n"
+        f"• Можно отправить альбомом или по одной\n\n"
         f"Когда закончите, нажмите кнопку <b>«Завершить добавление»</b> ниже."
     )
 
@@ -145,7 +162,7 @@ async def get_country(message: types.Message, state: FSMContext):
         f"Теперь отправьте <b>фотографии</b> мебели 📸\n"
         f"• Вы можете отправить несколько фотографий (не более 10)\n"
         f"• Рекомендуется отправлять фото с разных ракурсов\n"
-        f"• Каждое фото будет добавлено отдельно\n\n"
+        f"• Можно отправить альбомом или по одной\n\n"
         f"Когда закончите, нажмите кнопку <b>«Завершить добавление»</b> ниже."
     )
 
@@ -161,7 +178,10 @@ async def get_country(message: types.Message, state: FSMContext):
 
 
 @router.message(NewFurnitureStates.photos)
-async def get_photos(message: types.Message, state: FSMContext):
+async def get_photos(message: types.Message,
+                     state: FSMContext,
+                     uow: UnitOfWork,
+                     album: Optional[List[types.Message]] = None):
     data = await state.get_data()
     photos = data.get("photos", [])
 
@@ -176,31 +196,41 @@ async def get_photos(message: types.Message, state: FSMContext):
         country_name = data.get("country_name", "Не указана")
         kitchen_type = data.get("kitchen_type")
 
-        if kitchen_type and "кухонная" in category_name.lower():
-            description = f"[{kitchen_type}] {description}"
+        if "кухонная" not in category_name.lower():
+            kitchen_type = None
 
         crud = CrudFurniture()
-        new_furniture = await crud.create_furniture(
-            description=description,
-            category=category_name,
-            country=country_name
-        )
-
-        if not new_furniture:
+        # Мебель и ее фото — одна транзакция: не сохранилось одно — откатываем все.
+        # Сообщения отправляем уже после COMMIT
+        try:
+            async with uow.transaction():
+                new_furniture = await crud.create_furniture(
+                    description=description,
+                    category=category_name,
+                    country=country_name,
+                    subcategory=kitchen_type
+                )
+                if not new_furniture or not await crud.add_photos_to_furniture(new_furniture.id, photos):
+                    raise FurnitureNotSaved()
+        except FurnitureNotSaved:
             await message.answer("❌ <b>Ошибка сохранения</b>\n\n"
                                  "Произошла ошибка при сохранении мебели в базу данных.\n"
                                  "Обратитесь к администратору или попробуйте позже.")
             return
 
-        photo_added = await crud.add_photos_to_furniture(new_furniture.id, photos)
+        await message.answer("✅ <b>Фотографии добавлены</b>\n\n"
+                             "Все фотографии успешно сохранены.")
 
-        if not photo_added:
-            await message.answer("⚠️ <b>Предупреждение</b>\n\n"
-                                 "Мебель успешно создана, но фотографии не были добавлены.\n"
-                                 "Вы можете добавить фото позже в разделе редактирования.")
-        else:
-            await message.answer("✅ <b>Фотографии добавлены</b>\n\n"
-                                 "Все фотографии успешно сохранены.")
+        if config.CATALOG_CHANNEL_ID:
+            try:
+                furniture = await crud.get_furniture_by_id(new_furniture.id)
+                message_ids = await publish_card_to_channel(
+                    message.bot, render_furniture_card(furniture, category_name)
+                )
+                await crud.set_channel_messages(new_furniture.id, message_ids)
+            except Exception as exc:
+                logging.exception("Не удалось опубликовать мебель id=%s в канал-хранилище: %s",
+                                  new_furniture.id, exc)
 
         text = (
             "🎉 <b>Мебель успешно добавлена!</b>\n\n"
@@ -217,17 +247,28 @@ async def get_photos(message: types.Message, state: FSMContext):
         await state.clear()
         return
 
-    if message.photo:
-        photo_file_id = message.photo[-1].file_id
-        photos.append(photo_file_id)
-        await state.update_data(photos=photos)
+    new_photo_ids = [item.photo[-1].file_id for item in album or [message] if item.photo]
 
-        await message.answer(f"✅ Фото добавлено ({len(photos)}/10)\n\n"
-                             f"📸 Отправьте еще фотографии или нажмите «Завершить добавление».")
+    if new_photo_ids:
+        added = new_photo_ids[:max(0, MAX_ALBUM_PHOTOS - len(photos))]
+        photos.extend(added)
+        await state.update_data(photos=photos)
 
-        if len(photos) >= 10:
-            await message.answer("Вы достигли максимального количества фотографий (10).\n"
+        if len(added) == 1:
+            text = f"✅ Фото добавлено ({len(photos)}/{MAX_ALBUM_PHOTOS})"
+        else:
+            text = f"✅ Добавлено фото: {len(added)} ({len(photos)}/{MAX_ALBUM_PHOTOS})"
+
+        if len(photos) >= MAX_ALBUM_PHOTOS:
+            skipped = len(new_photo_ids) - len(added)
+            if skipped:
+                text += f"\nНе добавлено (сверх лимита): {skipped}"
+            await message.answer(f"{text}\n\n"
+                                 f"Вы достигли максимального количества фотографий ({MAX_ALBUM_PHOTOS}).\n"
                                  "Нажмите «Завершить добавление» для сохранения мебели.")
+        else:
+            await message.answer(f"{text}\n\n"
+                                 f"📸 Отправьте еще фотографии или нажмите «Завершить добавление».")
     else:
         await message.answer("⚠️ <b>Неподдерживаемый формат</b>\n\n"
                              "Пожалуйста, отправьте фотографию или нажмите кнопку «Завершить добавление».")
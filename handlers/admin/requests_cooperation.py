@@ -1,108 +1,158 @@
+import logging
+from typing import Optional
+
 from aiogram import Router, F
+from aiogram.exceptions import TelegramAPIError
 from aiogram.types import CallbackQuery
 
 from database.crud import CrudCooperation
-from keyboard.keyboard_builder import make_tasks_inline_keyboard, make_row_inline_keyboards
+from database.models import COOPERATION_ACCEPTED, COOPERATION_NEW, COOPERATION_REJECTED
+from keyboard.keyboard_builder import make_tasks_page_inline_keyboard, make_row_inline_keyboards
 from keyboard.button_template import get_accept_cancel_buttons, admin_kb
+from settings import config
 
 router = Router()
 
+STATUS_TITLES = {
+    COOPERATION_NEW: "🆕 Новая",
+    COOPERATION_ACCEPTED: "✅ Одобрена",
+    COOPERATION_REJECTED: "❌ Отклонена",
+}
 
-@router.callback_query(F.data == 'cooperation_requests')
-async def show_requests_cooperation(callback: CallbackQuery):
-    await callback.answer()
-    requests = await CrudCooperation().get_all_requests()
 
-    if requests:
-        await callback.message.edit_text(
-            '📋 <b>Текущие заявки на сотрудничество:</b>',
-            reply_markup=make_tasks_inline_keyboard(tasks=requests, callback_data_name="task")
-        )
+def _request_text(task) -> str:
+    text = (
+        f"<b>Заявка #{task.id}</b>\n"
+        f"👤 Пользователь: @{task.username} (ID: {task.telegram_id})\n\n"
+        f"📩 Сообщение от пользователя:\n{task.text_requests}\n\n"
+        f"🕒 Отправлено: {task.request_created_at.strftime('%Y-%m-%d %H:%M:%S')}"
+    )
+    if task.status != COOPERATION_NEW:
+        text += f"\n📌 Статус: {STATUS_TITLES.get(task.status, task.status)}"
+        if task.reviewed_at:
+            text += f" ({task.reviewed_at.strftime('%Y-%m-%d %H:%M:%S')})"
+    return text
+
+
+async def show_requests_page(callback: CallbackQuery,
+                             after_id: Optional[int] = None,
+                             before_id: Optional[int] = None,
+                             header: str = "") -> None:
+    """
+    Показать страницу новых заявок. Берем на одну заявку больше лимита,
+    чтобы узнать, есть ли следующая страница в направлении листания.
+    """
+    crud = CrudCooperation()
+    limit = config.COOPERATION_PAGE_SIZE
+    page = await crud.get_requests_page(after_id=after_id, before_id=before_id, limit=limit + 1)
+
+    if before_id is not None:
+        has_prev, has_next = len(page) > limit, True
+        page = page[-limit:]
     else:
-        await callback.message.edit_text("<b>❌ Пока что нет новых заявок на сотрудничество.</b>",
+        has_prev, has_next = after_id is not None, len(page) > limit
+        page = page[:limit]
+
+    if not page and (after_id is not None or before_id is not None):
+        # Заявки на этой странице успели обработать — начинаем с первой
+        return await show_requests_page(callback, header=header)
+
+    if not page:
+        await callback.message.edit_text(f"{header}<b>❌ Пока что нет новых заявок на сотрудничество.</b>",
                                          reply_markup=make_row_inline_keyboards(admin_kb))
+        return
+
+    total = await crud.count_requests()
+    await callback.message.edit_text(
+        f"{header}📋 <b>Новые заявки на сотрудничество:</b> {total}",
+        reply_markup=make_tasks_page_inline_keyboard(
+            tasks=page,
+            callback_data_name="task",
+            prev_callback=f"cooperation_page_before_{page[0].id}" if has_prev else None,
+            next_callback=f"cooperation_page_after_{page[-1].id}" if has_next else None,
+            back_callback="settings_bot",
+        )
+    )
+
+
+@router.callback_query(F.data.in_({'cooperation_requests', 'show_requests_cooperation_2'}))
+async def show_requests_cooperation(callback: CallbackQuery):
+    await callback.answer()
+    await show_requests_page(callback)
+
+
+@router.callback_query(F.data.startswith("cooperation_page_after_"))
+async def show_requests_next_page(callback: CallbackQuery):
+    await callback.answer()
+    await show_requests_page(callback, after_id=int(callback.data.removeprefix("cooperation_page_after_")))
+
+
+@router.callback_query(F.data.startswith("cooperation_page_before_"))
+async def show_requests_prev_page(callback: CallbackQuery):
+    await callback.answer()
+    await show_requests_page(callback, before_id=int(callback.data.removeprefix("cooperation_page_before_")))
 
 
 @router.callback_query(F.data.startswith("task_"))
 async def handle_cooperation_request(callback: CallbackQuery):
     await callback.answer()
-    request_id = callback.data.removeprefix("task_")
+    request_id = int(callback.data.removeprefix("task_"))
 
     task = await CrudCooperation().get_requests_by_id(request_id)
+    if task is None:
+        await show_requests_page(callback, header=f"⚠️ Заявка #{request_id} не найдена.\n\n")
+        return
 
-    response = (
-        f"<b>Заявка #{task.id}</b>\n"
-        f"👤 Пользователь: @{task.username} (ID: {task.telegram_id})\n\n"
-        f"📩 Сообщение от пользователя:\n{task.text_requests}\n\n"
-        f"🕒 Отправлено: {task.request_created_at.strftime('%Y-%m-%d %H:%M:%S')}"
-    )
+    if task.status != COOPERATION_NEW:
+        buttons = [("⏪ Отмена", "show_requests_cooperation_2")]
+    else:
+        buttons = get_accept_cancel_buttons(request_id)
+
+    await callback.message.edit_text(_request_text(task), reply_markup=make_row_inline_keyboards(buttons))
 
-    await callback.message.edit_text(
-        response,
-        reply_markup=make_row_inline_keyboards(get_accept_cancel_buttons(int(request_id)))
-    )
+
+async def _notify_user(callback: CallbackQuery, telegram_id: int, text: str) -> None:
+    try:
+        await callback.bot.send_message(chat_id=telegram_id, text=text)
+    except TelegramAPIError as exc:
+        # Пользователь мог заблокировать бота — решение по заявке уже сохранено
+        logging.warning("Не удалось уведомить пользователя %s о решении по заявке: %s", telegram_id, exc)
 
 
 @router.callback_query(F.data.startswith("cancel_cooperation_requests_"))
 async def cancel_cooperation_request(callback: CallbackQuery):
     request_id = int(callback.data.removeprefix("cancel_cooperation_requests_"))
-    await callback.answer()
 
-    crud = CrudCooperation()
-    task = await crud.get_requests_by_id(request_id)
+    task = await CrudCooperation().cancel_request(request_id)
+    if task is None:
+        await callback.answer("Заявка уже обработана.", show_alert=True)
+        await show_requests_page(callback)
+        return
 
-    await crud.cancel_request(request_id)
-    await callback.message.edit_text(f"❌ Заявка #{request_id} отклонена и удалена из списка.",
-                                     reply_markup=make_row_inline_keyboards(admin_kb))
     await callback.answer("Заявка успешно отклонена.")
-
-    if task:
-        await callback.bot.send_message(
-            chat_id=task.telegram_id,
-            text='Ваш запрос на сотрудничество, к сожалению, отклонён. Мы будем рады рассмотреть ваши новые предложения!'
-        )
+    await _notify_user(
+        callback, task.telegram_id,
+        'Ваш запрос на сотрудничество, к сожалению, отклонён. Мы будем рады рассмотреть ваши новые предложения!'
+    )
+    await show_requests_page(callback, header=f"❌ Заявка #{request_id} отклонена.\n\n")
 
 
 @router.callback_query(F.data.startswith("accepted_cooperation_requests_"))
 async def accept_cooperation_request(callback: CallbackQuery):
     request_id = int(callback.data.removeprefix("accepted_cooperation_requests_"))
-    await callback.answer()
-
-    crud = CrudCooperation()
-    task = await crud.get_requests_by_id(request_id)
-
-    if task:
-        await crud.accept_request(request_id)
-        requests_buttons = await crud.get_all_requests()
-        response = (
-            f"✅ Заявка #{request_id} успешно одобрена. Сотрудничество начато.\n\n"
-            f"<b>Заявка #{request_id}</b>\n"
-            f"👤 Пользователь: @{task.username} (ID: {task.telegram_id})\n\n"
-            f"📩 Сообщение от пользователя:\n{task.text_requests}\n\n"
-            f"🕒 Отправлено: {task.request_created_at.strftime('%Y-%m-%d %H:%M:%S')}"
-        )
-
-        await callback.bot.send_message(
-            chat_id=task.telegram_id,
-            text='Поздравляем! Ваш запрос на сотрудничество одобрен. В ближайшее время с вами свяжутся.'
-        )
-
-        await callback.message.edit_text(
-            response,
-            reply_markup=make_tasks_inline_keyboard(tasks=requests_buttons, callback_data_name="task")
-        )
 
+    task = await CrudCooperation().accept_request(request_id)
+    if task is None:
+        await callback.answer("Заявка уже обработана.", show_alert=True)
+        await show_requests_page(callback)
+        return
 
-@router.callback_query(F.data == 'show_requests_cooperation_2')
-async def show_requests_cooperation_2(callback: CallbackQuery):
-    await callback.answer()
-    requests = await CrudCooperation().get_all_requests()
-
-    if requests:
-        await callback.message.edit_text(
-            '📋 <b>Текущие заявки на сотрудничество:</b>',
-            reply_markup=make_tasks_inline_keyboard(tasks=requests, callback_data_name="task")
-        )
-    else:
-        await callback.message.edit_text("<b>❌ Пока что нет новых заявок на сотрудничество.</b>",
-                                         reply_markup=make_row_inline_keyboards(admin_kb))
+    await callback.answer("Заявка одобрена.")
+    await _notify_user(
+        callback, task.telegram_id,
+        'Поздравляем! Ваш запрос на сотрудничество одобрен. В ближайшее время с вами свяжутся.'
+    )
+    await show_requests_page(
+        callback,
+        header=f"✅ Заявка #{request_id} успешно одобрена. Сотрудничество начато.\n\n{_request_text(task)}\n\n"
+    )
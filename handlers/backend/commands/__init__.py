@@ -14,3 +14,6 @@ router.include_router(about_company_router)
 
 from .help import router as help_router
 router.include_router(help_router)
+
+from .search import router as search_router
+router.include_router(search_router)
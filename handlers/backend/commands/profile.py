@@ -1,14 +1,14 @@
+from typing import Optional
+
 from aiogram import Router, types, filters
-from database.crud import UserCrud
+from database.models import User
 
 router = Router()
 
 
 @router.message(filters.Command("profile"))
-async def profile_command(message: types.Message):
+async def profile_command(message: types.Message, user: Optional[User] = None):
     telegram_id = message.from_user.id
-    crud = UserCrud()
-    user = await crud.get_user_by_telegram_id(telegram_id)
 
     if not user:
         await message.answer("🚫 Пользователь не найден в базе данных.")
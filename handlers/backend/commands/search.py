@@ -0,0 +1,71 @@
+import html
+
+from aiogram import Router, F, types, filters
+from aiogram.fsm.context import FSMContext
+
+from database.crud import CrudFurniture, SEARCH_MIN_TERM_LENGTH
+from handlers.backend.furniture_handlers.furniture_card import get_furniture_card, send_furniture_cards
+from keyboard.keyboard_builder import make_row_inline_keyboards
+
+router = Router()
+
+SEARCH_PAGE_SIZE = 5
+
+
+async def show_search_results(message: types.Message, query: str, offset: int = 0):
+    crud = CrudFurniture()
+
+    if not crud.build_search_query(query):
+        await message.answer(f"⚠️ Слишком короткий запрос. "
+                             f"Введите хотя бы одно слово от {SEARCH_MIN_TERM_LENGTH} букв.")
+        return
+
+    total = await crud.count_search_results(query)
+    results = await crud.search_furniture(query, limit=SEARCH_PAGE_SIZE, offset=offset)
+
+    if not results:
+        await message.answer(f"🔎 По запросу «{html.escape(query)}» ничего не найдено.\n\n"
+                             "Попробуйте другое слово или выберите категорию в главном меню.")
+        return
+
+    cards = [get_furniture_card(furniture, furniture.category_name) for furniture in results]
+    await send_furniture_cards(message, cards)
+
+    shown = offset + len(results)
+    reply_markup = None
+    if shown < total:
+        reply_markup = make_row_inline_keyboards([("➡️ Показать еще", f"search_more_{shown}")])
+
+    await message.answer(
+        f"🔎 Результаты <b>{offset + 1}–{shown}</b> из <b>{total}</b> по запросу «{html.escape(query)}»",
+        reply_markup=reply_markup
+    )
+
+
+@router.message(filters.Command("search"))
+async def search_command(message: types.Message, command: filters.CommandObject, state: FSMContext):
+    query = (command.args or "").strip()
+
+    if not query:
+        await message.answer("🔎 <b>Поиск по каталогу</b>\n\n"
+                             "Напишите запрос после команды, например:\n"
+                             "<code>/search угловой диван</code>")
+        return
+
+    await state.update_data(search_query=query)
+    await show_search_results(message, query)
+
+
+@router.callback_query(F.data.startswith("search_more_"))
+async def search_more_callback(callback_query: types.CallbackQuery, state: FSMContext):
+    offset = int(callback_query.data.removeprefix("search_more_"))
+    user_data = await state.get_data()
+    query = user_data.get("search_query")
+
+    if not query:
+        await callback_query.answer("Повторите поиск командой /search", show_alert=True)
+        return
+
+    await callback_query.answer()
+    await callback_query.message.edit_reply_markup(reply_markup=None)
+    await show_search_results(callback_query.message, query, offset)
@@ -1,20 +1,20 @@
-import logging
+from typing import Optional
 
 from aiogram import Router, types, filters, F
 from aiogram.fsm.context import FSMContext
-from sqlalchemy.exc import IntegrityError
 
 from keyboard.button_template import start_kb
 from keyboard.keyboard_builder import make_row_inline_keyboards
 
-from database.crud import UserCrud
+from database.models import User
 
 router = Router()
 
 
 @router.message(filters.Command("start"))
 @router.message(F.text == "🏠 Главное меню")
-async def start(message: types.Message, state: FSMContext):
+async def start(message: types.Message, state: FSMContext, user: Optional[User] = None):
+    # Пользователь регистрируется и кешируется в UserMiddleware — здесь без запросов к базе
     await state.clear()
 
     welcome_text = (
@@ -37,37 +37,9 @@ async def start(message: types.Message, state: FSMContext):
     )
 
     keyboard = start_kb
-    telegram_id = message.from_user.id
-    crud = UserCrud()
-
-    try:
-        added_user = await crud.add_user(
-            telegram_id=telegram_id,
-            username=message.from_user.username,
-            first_name=message.from_user.first_name,
-            last_name=message.from_user.last_name,
-            is_admin=False,  # по умолчанию
-        )
-        if added_user:
-            logging.info("✅ Пользователь %s успешно зарегистрирован.", telegram_id)
-        else:
-            logging.info("👤 Пользователь %s уже существует или не был создан.", telegram_id)
-
-    except IntegrityError as ie:
-        logging.exception("❌ IntegrityError при добавлении пользователя %s: %s", telegram_id, ie)
-
-    except Exception as e:
-        logging.exception("❌ Ошибка при добавлении пользователя %s: %s", telegram_id, e)
-
-    user = await crud.get_user_by_telegram_id(message.from_user.id)
-
-    if user.is_admin:
+    if user is not None and user.is_admin:
         keyboard = start_kb + [("⚙️Настройки бота", 'settings_bot')]
-        await message.answer(
-            text=welcome_text,
-            reply_markup=make_row_inline_keyboards(keyboard))
 
-    else:
-        await message.answer(
-            text=welcome_text,
-            reply_markup=make_row_inline_keyboards(keyboard))
+    await message.answer(
+        text=welcome_text,
+        reply_markup=make_row_inline_keyboards(keyboard))
@@ -6,4 +6,7 @@ from .unified_furniture_handler import router as unified_furniture_router
 router.include_router(unified_furniture_router)
 
 from .navigation_handler import router as navigation_router
-router.include_router(navigation_router)
\ No newline at end of file
+router.include_router(navigation_router)
+
+from .inline_handler import router as inline_router
+router.include_router(inline_router)
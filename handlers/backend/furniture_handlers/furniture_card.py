@@ -0,0 +1,215 @@
+import html
+import logging
+import re
+from itertools import groupby
+from typing import List, NamedTuple
+
+from aiogram import Bot, types
+
+from database.cache import catalog_cache, furniture_tag
+from database.models import Furniture
+from settings import config
+
+MAX_ALBUM_PHOTOS = 10
+CAPTION_LIMIT = 1024
+MESSAGE_LIMIT = 4096
+COPY_MESSAGES_LIMIT = 100
+
+
+class FurnitureCard(NamedTuple):
+    text: str
+    photo_ids: List[str]
+
+
+def render_furniture_card(furniture: Furniture, category_name: str) -> FurnitureCard:
+    displayed_kitchen_type = ""
+    if furniture.subcategory and "кухонная" in category_name.lower():
+        displayed_kitchen_type = f"🍳 <b>Тип кухни:</b> {furniture.subcategory}\n"
+
+    text = (
+        f"🪑 <b>{category_name}</b>\n"
+        f"{'─' * 30}\n"
+        f"{furniture.description}\n\n"
+        f"{displayed_kitchen_type}"
+        f"🌍 <b>Страна производства:</b> {furniture.country_origin}\n"
+        f"📅 <b>Дата добавления:</b> {furniture.created_at.strftime('%d.%m.%Y') if furniture.created_at else 'Не указана'}\n"
+        f"{'─' * 30}\n\n"
+        f"💬 <b>Для заказа этой мебели:</b>\n"
+        f"📲 WhatsApp: https://wa.me/+{config.NUMBER}\n"
+        f".telegram: https://t.me/{config.TELEGRAM}\n\n"
+        f"✨ <b>Подписывайтесь на нас в Instagram</b>\n"
+        f"и будьте в курсе новинок и акций:\n"
+        f"📸 https://instagram.com/{config.INSTAGRAM}"
+    )
+
+    photo_ids = [photo.file_id for photo in furniture.photos[:MAX_ALBUM_PHOTOS]]
+    return FurnitureCard(text=text, photo_ids=photo_ids)
+
+
+def get_furniture_card(furniture: Furniture, category_name: str) -> FurnitureCard:
+    """
+    Вернуть готовую карточку товара: текст и file_id фотографий.
+    Карточка собирается один раз и лежит в catalog_cache под тегом товара,
+    поэтому CrudFurniture сбрасывает ее вместе со страницами при изменении фото.
+    """
+    cache_key = ("card", furniture.id, category_name)
+    card = catalog_cache.get(cache_key)
+    if card is None:
+        card = render_furniture_card(furniture, category_name)
+        catalog_cache.set(cache_key, card, tags=[furniture_tag(furniture.id)])
+    return card
+
+
+def visible_length(text: str) -> int:
+    """Длина текста так, как ее считает Telegram: без HTML-тегов, в UTF-16 символах."""
+    plain = html.unescape(re.sub(r"<[^>]+>", "", text))
+    return len(plain.encode("utf-16-le")) // 2
+
+
+def pack_texts(texts: List[str], limit: int = MESSAGE_LIMIT) -> List[str]:
+    """Склеить тексты карточек в как можно меньшее число сообщений не длиннее limit."""
+    chunks = []
+    current = ""
+    for text in texts:
+        candidate = f"{current}\n\n{text}" if current else text
+        if current and visible_length(candidate) > limit:
+            chunks.append(current)
+            candidate = text
+        current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def send_card_album(message: types.Message, card: FurnitureCard, caption: str = None) -> None:
+    if len(card.photo_ids) == 1:
+        # Альбом в Bot API — от 2 до 10 фото, одно фото отправляется обычным сообщением
+        await message.answer_photo(card.photo_ids[0], caption=caption)
+        return
+
+    media_group = [types.InputMediaPhoto(media=file_id) for file_id in card.photo_ids]
+    if caption:
+        media_group[0] = types.InputMediaPhoto(media=card.photo_ids[0], caption=caption)
+
+    try:
+        await message.answer_media_group(media_group)
+    except Exception:
+        for index, file_id in enumerate(card.photo_ids):
+            await message.answer_photo(file_id, caption=caption if index == 0 else None)
+
+
+async def send_furniture_cards(message: types.Message, cards: List[FurnitureCard]) -> None:
+    """
+    Отправить карточки страницы.
+    В режиме "caption" текст карточки уходит подписью к первому фото альбома
+    (отдельным сообщением — только если не влезает в лимит подписи), а карточки
+    без фото склеиваются в общее текстовое сообщение.
+    """
+    if config.CATALOG_RENDER_MODE != "caption":
+        for card in cards:
+            if card.photo_ids:
+                await send_card_album(message, card)
+            else:
+                await message.answer("📷 Фотографии отсутствуют")
+            await message.answer(card.text, disable_web_page_preview=True)
+        return
+
+    without_photos = []
+    for card in cards:
+        if not card.photo_ids:
+            without_photos.append(card.text)
+        elif visible_length(card.text) <= CAPTION_LIMIT:
+            await send_card_album(message, card, caption=card.text)
+        else:
+            await send_card_album(message, card)
+            await message.answer(card.text, disable_web_page_preview=True)
+
+    for text in pack_texts(without_photos):
+        await message.answer(text, disable_web_page_preview=True)
+
+
+def channel_message_ids(furniture: Furniture) -> List[int]:
+    if not furniture.channel_message_ids:
+        return []
+    return [int(message_id) for message_id in furniture.channel_message_ids.split(",")]
+
+
+async def publish_card_to_channel(bot: Bot, card: FurnitureCard) -> List[int]:
+    """
+    Один раз опубликовать карточку в канал-хранилище (config.CATALOG_CHANNEL_ID)
+    и вернуть id сообщений — дальше каталог только копирует их.
+    """
+    channel_id = config.CATALOG_CHANNEL_ID
+    if not card.photo_ids:
+        sent = await bot.send_message(channel_id, card.text, disable_web_page_preview=True)
+        return [sent.message_id]
+
+    fits_caption = visible_length(card.text) <= CAPTION_LIMIT
+    caption = card.text if fits_caption else None
+    if len(card.photo_ids) == 1:
+        # Альбом в Bot API — от 2 до 10 фото, одно фото отправляется обычным сообщением
+        sent = await bot.send_photo(channel_id, card.photo_ids[0], caption=caption)
+        message_ids = [sent.message_id]
+    else:
+        media_group = [types.InputMediaPhoto(media=file_id) for file_id in card.photo_ids]
+        media_group[0] = types.InputMediaPhoto(media=card.photo_ids[0], caption=caption)
+        sent_messages = await bot.send_media_group(channel_id, media_group)
+        message_ids = [sent.message_id for sent in sent_messages]
+    if not fits_caption:
+        sent = await bot.send_message(channel_id, card.text, disable_web_page_preview=True)
+        message_ids.append(sent.message_id)
+    return message_ids
+
+
+async def copy_cards_from_channel(message: types.Message, furniture_list: List[Furniture]) -> List[int]:
+    """
+    Скопировать карточки из канала-хранилища в порядке furniture_list и вернуть
+    id товаров, которые дошли. copyMessages берет до 100 сообщений строго по
+    возрастанию id (альбомы при этом сохраняются), поэтому новый вызов начинается,
+    когда лимит исчерпан или карточка лежит в канале раньше предыдущей. После
+    ошибки копирование останавливается — отправленные карточки не повторяются.
+    """
+    chunks = []
+    for furniture in furniture_list:
+        message_ids = channel_message_ids(furniture)
+        if not message_ids:
+            break
+        if (chunks and len(chunks[-1][1]) + len(message_ids) <= COPY_MESSAGES_LIMIT
+                and message_ids[0] > chunks[-1][1][-1]):
+            chunks[-1][0].append(furniture.id)
+            chunks[-1][1].extend(message_ids)
+        else:
+            chunks.append(([furniture.id], message_ids))
+
+    delivered = []
+    for furniture_ids, message_ids in chunks:
+        try:
+            await message.bot.copy_messages(
+                chat_id=message.chat.id,
+                from_chat_id=config.CATALOG_CHANNEL_ID,
+                message_ids=message_ids
+            )
+        except Exception as exc:
+            logging.exception("Не удалось скопировать карточки из канала-хранилища: %s", exc)
+            break
+        delivered.extend(furniture_ids)
+    return delivered
+
+
+def _stored_in_channel(furniture: Furniture) -> bool:
+    return bool(config.CATALOG_CHANNEL_ID and furniture.channel_message_ids)
+
+
+async def send_catalog_page(message: types.Message, furniture_list: List[Furniture], category_name: str) -> None:
+    """
+    Отправить страницу каталога в порядке товаров: подряд идущие карточки из
+    канала-хранилища копируются, остальные собираются и отправляются на месте.
+    Если копирование сорвалось, недошедшие карточки отрезка тоже собираются.
+    """
+    for stored, group in groupby(furniture_list, key=_stored_in_channel):
+        group = list(group)
+        if stored:
+            delivered = set(await copy_cards_from_channel(message, group))
+            group = [furniture for furniture in group if furniture.id not in delivered]
+        if group:
+            await send_furniture_cards(message, [get_furniture_card(furniture, category_name) for furniture in group])
@@ -0,0 +1,78 @@
+from typing import List, Tuple
+
+from aiogram import Router, types
+
+from database.cache import category_tag, furniture_tag, inline_cache
+from database.crud import CrudFurniture
+from database.models import Furniture
+from settings import config
+from .furniture_card import CAPTION_LIMIT, get_furniture_card, visible_length
+from .unified_furniture_handler import FURNITURE_NAMES
+
+router = Router()
+
+INLINE_PAGE_SIZE = 20
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def _build_result(furniture: Furniture) -> types.InlineQueryResultUnion:
+    card = get_furniture_card(furniture, furniture.category_name)
+    if card.photo_ids and visible_length(card.text) <= CAPTION_LIMIT:
+        return types.InlineQueryResultCachedPhoto(
+            id=str(furniture.id),
+            photo_file_id=card.photo_ids[0],
+            caption=card.text
+        )
+
+    return types.InlineQueryResultArticle(
+        id=str(furniture.id),
+        title=furniture.category_name,
+        description=(furniture.description or "")[:100],
+        input_message_content=types.InputTextMessageContent(
+            message_text=card.text,
+            link_preview_options=types.LinkPreviewOptions(is_disabled=True)
+        )
+    )
+
+
+async def get_inline_results(query: str, after_id: int = None) -> Tuple[List[types.InlineQueryResultUnion], str]:
+    cache_key = (query, after_id)
+    cached = inline_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    generation = inline_cache.generation()
+
+    categories = [name for name in FURNITURE_NAMES.values() if query in name.lower()]
+    furniture_list = await CrudFurniture().get_furniture_by_categories(
+        categories, after_id=after_id, limit=INLINE_PAGE_SIZE
+    )
+
+    results = [_build_result(furniture) for furniture in furniture_list]
+    # next_offset — курсор: id последнего отданного товара
+    next_offset = str(furniture_list[-1].id) if len(furniture_list) == INLINE_PAGE_SIZE else ""
+
+    # Как страницы каталога: карточки меняют свои фото, неполную страницу — новые товары категорий
+    tags = [furniture_tag(furniture.id) for furniture in furniture_list]
+    if len(furniture_list) < INLINE_PAGE_SIZE:
+        tags.extend(category_tag(name) for name in categories)
+    inline_cache.set(cache_key, (results, next_offset), tags=tags, generation=generation)
+    return results, next_offset
+
+
+@router.inline_query()
+async def inline_catalog(inline_query: types.InlineQuery):
+    query = _normalize_query(inline_query.query)
+    after_id = int(inline_query.offset) if inline_query.offset.isdigit() else None
+
+    results, next_offset = await get_inline_results(query, after_id)
+
+    # Выдача одинакова для всех пользователей, поэтому Telegram может кешировать ее общей
+    await inline_query.answer(
+        results,
+        cache_time=config.INLINE_CACHE_TIME,
+        is_personal=False,
+        next_offset=next_offset
+    )
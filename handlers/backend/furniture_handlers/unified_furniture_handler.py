@@ -1,12 +1,14 @@
-import re
+from typing import Optional
 
 from aiogram import Router, F, types
+from aiogram.filters.callback_data import CallbackData
 from aiogram.fsm.context import FSMContext
 
-from settings import config
 from database.crud import CrudFurniture
-from keyboard.button_template import contry_of_origin_kb, kitchen_subcategory_inline_kb
+from keyboard.button_template import contry_of_origin_kb, kitchen_subcategory_inline_kb, start_kb
 from keyboard.keyboard_builder import make_row_inline_keyboards
+from settings import config
+from .furniture_card import CAPTION_LIMIT, FurnitureCard, get_furniture_card, send_catalog_page, visible_length
 
 router = Router()
 
@@ -38,80 +40,56 @@ TYPES_WITH_SUBCATEGORIES = {'kitchen_furniture'}
 ITEMS_PER_PAGE = 10
 
 
-def extract_kitchen_type(description: str) -> tuple:
-    match = re.search(r'\[(.*?)\]', description)
-    if match:
-        kitchen_type = match.group(1)
-        clean_description = re.sub(r'\[.*?\]\s*', '', description)
-        return kitchen_type, clean_description
-    return None, description
-
-
-async def show_furniture_list(message: types.Message, category_name: str, country: str = "🇷🇺 Россия", kitchen_type: str = None, page: int = 0):
+class CarouselCallback(CallbackData, prefix="crsl"):
+    # Индексы ключей FURNITURE_NAMES / ORIGIN_NAMES / KITCHEN_SUBCATEGORIES (-1 — не выбрано),
+    # чтобы callback_data уложилась в 64 байта
+    furniture_type: int
+    origin: int
+    kitchen: int
+    furniture_id: int
+    position: int
+    forward: bool
+
+
+async def show_furniture_list(message: types.Message,
+                              category_name: str,
+                              country: str = "🇷🇺 Россия",
+                              kitchen_type: str = None,
+                              state: FSMContext = None,
+                              after_id: int = None,
+                              shown_items: int = 0):
     crud = CrudFurniture()
 
     if "кухонная" in category_name.lower():
         country = "🇷🇺 Россия"
 
-    furniture_list = await crud.get_furniture_by_category_and_country(
+    paginated_furniture = await crud.get_furniture_page(
         category_name=category_name,
-        country=country
+        country=country,
+        kitchen_type=kitchen_type,
+        after_id=after_id,
+        limit=ITEMS_PER_PAGE
     )
 
-    if kitchen_type and furniture_list:
-        furniture_list = [
-            furniture for furniture in furniture_list
-            if f"[{kitchen_type}]" in furniture.description
-        ]
-
-    if not furniture_list:
+    if not paginated_furniture:
         await message.answer("📭 К сожалению, по данной категории пока нет добавленной мебели.\n\n"
                              "Но не переживайте! Наш ассортимент постоянно пополняется новыми моделями.\n"
                              "Рекомендуем периодически возвращаться и смотреть обновления.")
         return
 
-    total_items = len(furniture_list)
-    start_index = page * ITEMS_PER_PAGE
-    end_index = start_index + ITEMS_PER_PAGE
-    paginated_furniture = furniture_list[start_index:end_index]
-
-    for furniture in paginated_furniture:
-        displayed_kitchen_type = ""
-        if "кухонная" in category_name.lower():
-            kt, clean_description = extract_kitchen_type(furniture.description)
-            if kt:
-                displayed_kitchen_type = f"🍳 <b>Тип кухни:</b> {kt}\n"
-        else:
-            clean_description = furniture.description
-
-        furniture_text = (
-            f"🪑 <b>{category_name}</b>\n"
-            f"{'─' * 30}\n"
-            f"{clean_description}\n\n"
-            f"{displayed_kitchen_type}"
-            f"🌍 <b>Страна производства:</b> {furniture.country_origin}\n"
-            f"📅 <b>Дата добавления:</b> {furniture.created_at.strftime('%d.%m.%Y') if furniture.created_at else 'Не указана'}\n"
-            f"{'─' * 30}\n\n"
-            f"💬 <b>Для заказа этой мебели:</b>\n"
-            f"📲 WhatsApp: https://wa.me/+{config.NUMBER}\n"
-            f".telegram: https://t.me/{config.TELEGRAM}\n\n"
-            f"✨ <b>Подписывайтесь на нас в Instagram</b>\n"
-            f"и будьте в курсе новинок и акций:\n"
-            f"📸 https://instagram.com/{config.INSTAGRAM}"
-        )
+    total_items = await crud.count_furniture(
+        category_name=category_name,
+        country=country,
+        kitchen_type=kitchen_type
+    )
+    page = shown_items // ITEMS_PER_PAGE
+    end_index = shown_items + len(paginated_furniture)
 
-        photos = await crud.get_furniture_photos(furniture.id)
-        if photos:
-            media_group = [types.InputMediaPhoto(media=photo.file_id) for photo in photos[:10]]
-            try:
-                await message.answer_media_group(media_group)
-            except Exception:
-                for photo in photos[:10]:
-                    await message.answer_photo(photo.file_id)
-        else:
-            await message.answer("📷 Фотографии отсутствуют")
+    # Курсор: id последнего показанного товара, с него начнется следующая страница
+    if state is not None:
+        await state.update_data(last_furniture_id=paginated_furniture[-1].id, shown_items=end_index)
 
-        await message.answer(furniture_text, disable_web_page_preview=True)
+    await send_catalog_page(message, paginated_furniture, category_name)
 
     keyboard_buttons = [
         [types.KeyboardButton(text="🏠 Главное меню")]
@@ -138,11 +116,153 @@ async def show_furniture_list(message: types.Message, category_name: str, countr
     )
 
 
+def _key_index(mapping: dict, key: Optional[str]) -> int:
+    return list(mapping).index(key) if key in mapping else -1
+
+
+def _key_by_index(mapping: dict, index: int) -> Optional[str]:
+    return list(mapping)[index] if 0 <= index < len(mapping) else None
+
+
+def _carousel_keyboard(callback_data: CarouselCallback, position: int, total: int) -> types.InlineKeyboardMarkup:
+    navigation = []
+    if position > 1:
+        navigation.append(types.InlineKeyboardButton(
+            text="◀️",
+            callback_data=callback_data.model_copy(update={"position": position, "forward": False}).pack()
+        ))
+    navigation.append(types.InlineKeyboardButton(text=f"{position} / {total}", callback_data="carousel_position"))
+    if position < total:
+        navigation.append(types.InlineKeyboardButton(
+            text="▶️",
+            callback_data=callback_data.model_copy(update={"position": position, "forward": True}).pack()
+        ))
+
+    return types.InlineKeyboardMarkup(inline_keyboard=[
+        navigation,
+        [types.InlineKeyboardButton(text="🏠 Главное меню", callback_data="carousel_close")]
+    ])
+
+
+def _carousel_photo(card: FurnitureCard) -> Optional[str]:
+    # Карусель показывает первое фото с карточкой в подписи; длинные карточки — обычным текстом
+    if card.photo_ids and visible_length(card.text) <= CAPTION_LIMIT:
+        return card.photo_ids[0]
+    return None
+
+
+async def show_furniture_carousel(message: types.Message,
+                                  furniture_type: str,
+                                  origin_type: str = None,
+                                  kitchen_type_key: str = None):
+    """
+    Каталог одним сообщением: товар за товаром, листание кнопками ◀️/▶️.
+    Каждый шаг — одно редактирование сообщения вместо целой страницы.
+    """
+    crud = CrudFurniture()
+    category_name = FURNITURE_NAMES.get(furniture_type, 'Спальная мебель')
+    country = ORIGIN_NAMES.get(origin_type, "🇷🇺 Россия")
+    kitchen_type = KITCHEN_SUBCATEGORIES.get(kitchen_type_key)
+
+    if "кухонная" in category_name.lower():
+        country = "🇷🇺 Россия"
+
+    first_page = await crud.get_furniture_page(category_name, country, kitchen_type, limit=1)
+    if not first_page:
+        await message.answer("📭 К сожалению, по данной категории пока нет добавленной мебели.\n\n"
+                             "Но не переживайте! Наш ассортимент постоянно пополняется новыми моделями.\n"
+                             "Рекомендуем периодически возвращаться и смотреть обновления.")
+        return
+
+    furniture = first_page[0]
+    total = await crud.count_furniture(category_name, country, kitchen_type)
+    card = get_furniture_card(furniture, category_name)
+    callback_data = CarouselCallback(
+        furniture_type=_key_index(FURNITURE_NAMES, furniture_type),
+        origin=_key_index(ORIGIN_NAMES, origin_type),
+        kitchen=_key_index(KITCHEN_SUBCATEGORIES, kitchen_type_key),
+        furniture_id=furniture.id,
+        position=1,
+        forward=True
+    )
+    reply_markup = _carousel_keyboard(callback_data, 1, total)
+
+    photo = _carousel_photo(card)
+    if photo:
+        await message.answer_photo(photo, caption=card.text, reply_markup=reply_markup)
+    else:
+        await message.answer(card.text, reply_markup=reply_markup, disable_web_page_preview=True)
+
+
+@router.callback_query(CarouselCallback.filter())
+async def carousel_callback(callback_query: types.CallbackQuery, callback_data: CarouselCallback):
+    crud = CrudFurniture()
+    furniture_type = _key_by_index(FURNITURE_NAMES, callback_data.furniture_type)
+    category_name = FURNITURE_NAMES.get(furniture_type, 'Спальная мебель')
+    country = ORIGIN_NAMES.get(_key_by_index(ORIGIN_NAMES, callback_data.origin), "🇷🇺 Россия")
+    kitchen_type = KITCHEN_SUBCATEGORIES.get(_key_by_index(KITCHEN_SUBCATEGORIES, callback_data.kitchen))
+
+    if "кухонная" in category_name.lower():
+        country = "🇷🇺 Россия"
+
+    if callback_data.forward:
+        page = await crud.get_furniture_page(category_name, country, kitchen_type,
+                                             after_id=callback_data.furniture_id, limit=1)
+        furniture = page[0] if page else None
+        position = callback_data.position + 1
+    else:
+        furniture = await crud.get_furniture_before(category_name, country, callback_data.furniture_id,
+                                                    kitchen_type=kitchen_type)
+        position = callback_data.position - 1
+
+    if furniture is None:
+        await callback_query.answer("Больше товаров нет")
+        return
+
+    total = await crud.count_furniture(category_name, country, kitchen_type)
+    card = get_furniture_card(furniture, category_name)
+    reply_markup = _carousel_keyboard(
+        callback_data.model_copy(update={"furniture_id": furniture.id}), position, total
+    )
+
+    message = callback_query.message
+    photo = _carousel_photo(card)
+    if photo and message.photo:
+        await message.edit_media(types.InputMediaPhoto(media=photo, caption=card.text), reply_markup=reply_markup)
+    elif not photo and message.text:
+        await message.edit_text(card.text, reply_markup=reply_markup, disable_web_page_preview=True)
+    else:
+        # Фото-сообщение нельзя превратить в текстовое (и наоборот) — пересоздаем
+        await message.delete()
+        if photo:
+            await message.answer_photo(photo, caption=card.text, reply_markup=reply_markup)
+        else:
+            await message.answer(card.text, reply_markup=reply_markup, disable_web_page_preview=True)
+
+    await callback_query.answer()
+
+
+@router.callback_query(F.data == "carousel_position")
+async def carousel_position_callback(callback_query: types.CallbackQuery):
+    await callback_query.answer()
+
+
+@router.callback_query(F.data == "carousel_close")
+async def carousel_close_callback(callback_query: types.CallbackQuery, state: FSMContext):
+    await state.clear()
+    await callback_query.message.delete()
+    await callback_query.message.answer(
+        "🏠 <b>Главное меню</b>\n\nВыберите интересующую вас категорию ниже:",
+        reply_markup=make_row_inline_keyboards(start_kb)
+    )
+    await callback_query.answer()
+
+
 @router.callback_query(F.data.in_(FURNITURE_NAMES.keys()))
 async def furniture_callback(callback_query: types.CallbackQuery, state: FSMContext):
     furniture_type = callback_query.data
     await state.update_data(type_furniture=furniture_type)
-    await state.update_data(current_page=0)  # Тут сброс пагинации
+    await state.update_data(last_furniture_id=None, shown_items=0)  # Тут сброс пагинации
 
     if furniture_type in TYPES_WITH_SUBCATEGORIES:
         await callback_query.message.edit_text(
@@ -156,9 +276,12 @@ async def furniture_callback(callback_query: types.CallbackQuery, state: FSMCont
             reply_markup=make_row_inline_keyboards(contry_of_origin_kb)
         )
 
+    elif config.CATALOG_VIEW == "carousel":
+        await show_furniture_carousel(callback_query.message, furniture_type)
+
     else:
         category_name = FURNITURE_NAMES.get(furniture_type, 'Спальная мебель')
-        await show_furniture_list(callback_query.message, category_name)
+        await show_furniture_list(callback_query.message, category_name, state=state)
 
     await callback_query.answer()
 
@@ -170,14 +293,18 @@ async def kitchen_subcategory_callback(callback_query: types.CallbackQuery, stat
 
     await state.update_data(kitchen_subcategory=kitchen_type_key)
     await state.update_data(selected_kitchen_type=kitchen_type)
-    await state.update_data(current_page=0)  # Тут сброс пагинации
+    await state.update_data(last_furniture_id=None, shown_items=0)  # Тут сброс пагинации
 
-    await show_furniture_list(
-        callback_query.message,
-        "🍳 Кухонная мебель",
-        "🇷🇺 Россия",
-        kitchen_type
-    )
+    if config.CATALOG_VIEW == "carousel":
+        await show_furniture_carousel(callback_query.message, "kitchen_furniture", kitchen_type_key=kitchen_type_key)
+    else:
+        await show_furniture_list(
+            callback_query.message,
+            "🍳 Кухонная мебель",
+            "🇷🇺 Россия",
+            kitchen_type,
+            state=state
+        )
 
     await callback_query.answer()
 
@@ -189,13 +316,16 @@ async def origin_callback(callback_query: types.CallbackQuery, state: FSMContext
     origin_type = callback_query.data
 
     await state.update_data(origin_type=origin_type)
-    await state.update_data(current_page=0)  # Сброс пагинации
+    await state.update_data(last_furniture_id=None, shown_items=0)  # Сброс пагинации
 
     category_name = FURNITURE_NAMES.get(furniture_type, 'Спальная мебель')
     origin_name = ORIGIN_NAMES.get(origin_type, '🇷🇺 Россия')
     kitchen_type = user_data.get('selected_kitchen_type')
 
-    await show_furniture_list(callback_query.message, category_name, origin_name, kitchen_type)
+    if config.CATALOG_VIEW == "carousel":
+        await show_furniture_carousel(callback_query.message, furniture_type, origin_type=origin_type)
+    else:
+        await show_furniture_list(callback_query.message, category_name, origin_name, kitchen_type, state=state)
 
     await callback_query.answer()
 
@@ -209,9 +339,15 @@ async def more_furniture_handler(message: types.Message, state: FSMContext):
     origin_type = user_data.get('origin_type')
     origin_name = ORIGIN_NAMES.get(origin_type, '🇷🇺 Россия') if origin_type else "🇷🇺 Россия"
     kitchen_type = user_data.get('selected_kitchen_type')
-    current_page = user_data.get('current_page', 0)
-
-    new_page = current_page + 1
-    await state.update_data(current_page=new_page)
+    last_furniture_id = user_data.get('last_furniture_id')
+    shown_items = user_data.get('shown_items', 0)
 
-    await show_furniture_list(message, category_name, origin_name, kitchen_type, new_page)
+    await show_furniture_list(
+        message,
+        category_name,
+        origin_name,
+        kitchen_type,
+        state=state,
+        after_id=last_furniture_id,
+        shown_items=shown_items
+    )
@@ -20,6 +20,8 @@ admin_kb = [
     ("🗑️ Удалить мебель", "remove_furniture"),
     ("📋 Список категорий", "list_categories_furniture"),
     ("🤝 Заявки", "cooperation_requests"),
+    ("📥 Импорт каталога", "import_catalog"),
+    ("📤 Экспорт и резервная копия", "export_catalog"),
     ("◀️ Назад", "back_to_main")
 ]
 
@@ -33,6 +35,19 @@ build_cancel_kb = [
     ("❌ Отменить", "cancel_category"),
 ]
 
+# Кнопка отмены для импорта каталога
+cancel_import_kb = [
+    ("❌ Отменить", "cancel_import"),
+]
+
+# Выгрузка таблиц и копия базы
+export_catalog_kb = [
+    ("📄 Таблицы в JSONL", "export_catalog_jsonl"),
+    ("📊 Таблицы в CSV", "export_catalog_csv"),
+    ("💾 Копия базы SQLite", "backup_database"),
+    ("◀️ Назад", "settings_bot"),
+]
+
 country_kb = [
     "🇷🇺 Россия",
     "🇹🇷 Турция"
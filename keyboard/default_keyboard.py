@@ -11,8 +11,14 @@ profile_command = BotCommand(
     description='📊 Ваш профиль и статистика использования'
 )
 
+search_command = BotCommand(
+    command='search',
+    description='🔎 Поиск мебели по описанию'
+)
+
 # 📋 Список всех команд
 commands = [
     start_command,
     profile_command,
+    search_command,
 ]
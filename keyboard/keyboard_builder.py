@@ -1,4 +1,4 @@
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from aiogram.types import (ReplyKeyboardMarkup,
                            KeyboardButton,
                            InlineKeyboardMarkup,
@@ -67,3 +67,36 @@ def make_tasks_inline_keyboard(tasks: list, callback_data_name: str) -> InlineKe
         keyboard.append([button])
 
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
+
+
+def make_tasks_page_inline_keyboard(tasks: list,
+                                    callback_data_name: str,
+                                    prev_callback: Optional[str],
+                                    next_callback: Optional[str],
+                                    back_callback: str) -> InlineKeyboardMarkup:
+    """
+    Страница списка задач: кнопка на каждую задачу, ряд «назад/вперед» и возврат в меню.
+
+    :param tasks: задачи текущей страницы (объекты с атрибутами id и username)
+    :param callback_data_name: префикс callback_data кнопки задачи
+    :param prev_callback: callback_data предыдущей страницы или None, если ее нет
+    :param next_callback: callback_data следующей страницы или None, если ее нет
+    :param back_callback: callback_data кнопки возврата
+    :return: InlineKeyboardMarkup
+    """
+    keyboard = [
+        [InlineKeyboardButton(text=f'Запрос #{task.id} · @{task.username}',
+                              callback_data=f'{callback_data_name}_{task.id}')]
+        for task in tasks
+    ]
+
+    navigation = []
+    if prev_callback:
+        navigation.append(InlineKeyboardButton(text='◀️', callback_data=prev_callback))
+    if next_callback:
+        navigation.append(InlineKeyboardButton(text='▶️', callback_data=next_callback))
+    if navigation:
+        keyboard.append(navigation)
+
+    keyboard.append([InlineKeyboardButton(text='◀️ Назад', callback_data=back_callback)])
+    return InlineKeyboardMarkup(inline_keyboard=keyboard)
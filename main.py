@@ -1,16 +1,24 @@
 import asyncio
 import logging
+import ssl
 
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
 from aiogram.exceptions import TelegramBadRequest
+from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.methods import DeleteWebhook
-from aiogram.types import BotCommandScopeAllPrivateChats
+from aiogram.types import BotCommandScopeAllPrivateChats, FSInputFile
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
 
+from database.fsm_storage import BoundedMemoryStorage, SQLStorage
+from database.write_queue import write_queue
 from handlers import router
 from keyboard.default_keyboard import commands
-from settings.config import ConfigBot
+from middlewares import FSMFlushMiddleware, OutboundScheduler, UnitOfWorkMiddleware, UserMiddleware
+from settings import config
+from settings.config import ConfigBot, ConfigWebhook
 
 logging.basicConfig(
     level=logging.INFO,
@@ -18,21 +26,95 @@ logging.basicConfig(
 )
 
 
+async def run_polling(bot: Bot, dp: Dispatcher):
+    # Удаление всех старый вебхуков
+    await bot(DeleteWebhook(drop_pending_updates=True))
+
+    # Запуск бота
+    await dp.start_polling(bot, skip_updates=True)
+
+
+async def run_webhook(bot: Bot, dp: Dispatcher):
+    if not ConfigWebhook.BASE_URL or not ConfigWebhook.SECRET:
+        raise RuntimeError("Для RUN_MODE=webhook нужны WEBHOOK_BASE_URL и WEBHOOK_SECRET")
+
+    app = web.Application()
+
+    # Telegram сразу получает 200 OK, а апдейт обрабатывается в фоне
+    SimpleRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        secret_token=ConfigWebhook.SECRET,
+        handle_in_background=True,
+    ).register(app, path=ConfigWebhook.PATH)
+    setup_application(app, dp, bot=bot)
+
+    ssl_context = None
+    certificate = None
+    if ConfigWebhook.SSL_CERT and ConfigWebhook.SSL_KEY:
+        ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        ssl_context.load_cert_chain(ConfigWebhook.SSL_CERT, ConfigWebhook.SSL_KEY)
+        # Самоподписанный сертификат нужно передать Telegram вместе с вебхуком
+        certificate = FSInputFile(ConfigWebhook.SSL_CERT)
+
+    await bot.set_webhook(
+        url=f"{ConfigWebhook.BASE_URL.rstrip('/')}{ConfigWebhook.PATH}",
+        certificate=certificate,
+        secret_token=ConfigWebhook.SECRET,
+        allowed_updates=dp.resolve_used_update_types(),
+        drop_pending_updates=ConfigWebhook.DROP_PENDING_UPDATES,
+    )
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host=ConfigWebhook.HOST, port=ConfigWebhook.PORT, ssl_context=ssl_context)
+    await site.start()
+    logging.info("Webhook сервер запущен на %s:%s%s", ConfigWebhook.HOST, ConfigWebhook.PORT, ConfigWebhook.PATH)
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
 async def main():
     bot = Bot(token=ConfigBot.TOKEN, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
-    dp = Dispatcher()
+    if config.FSM_STORAGE == "sql":
+        storage = SQLStorage()
+    elif config.FSM_STORAGE == "bounded":
+        storage = BoundedMemoryStorage()
+    else:
+        storage = MemoryStorage()
+    dp = Dispatcher(storage=storage)
+
+    # Изменения FSM за апдейт пишутся в базу одним запросом
+    if isinstance(storage, SQLStorage):
+        dp.update.outer_middleware(FSMFlushMiddleware(storage))
+
+    # Пользователь из кеша (или upsert для новых) доступен в хендлерах как user
+    dp.update.outer_middleware(UserMiddleware())
+
+    # UnitOfWork апдейта: каждое чтение — своя короткая сессия, общая транзакция — только
+    # в блоках uow.transaction(); регистрируется после UserMiddleware, upsert пользователя
+    # идет через общую очередь записей
+    dp.update.outer_middleware(UnitOfWorkMiddleware())
+
+    # При остановке дописываем все, что осталось в очереди записей
+    dp.shutdown.register(write_queue.close)
+
+    # Все исходящие запросы проходят через общий планировщик с лимитами Telegram
+    bot.session.middleware(OutboundScheduler())
 
     # Подключение всех роутеров
     dp.include_router(router)
 
-    # Удаление всех старый вебхуков
-    await bot(DeleteWebhook(drop_pending_updates=True))
-
     # Подключение базовой менюшки со всеми командами
     await bot.set_my_commands(commands=commands, scope=BotCommandScopeAllPrivateChats())
 
-    # Запуск бота
-    await dp.start_polling(bot, skip_updates=True)
+    if config.RUN_MODE == "webhook":
+        await run_webhook(bot, dp)
+    else:
+        await run_polling(bot, dp)
 
 
 if __name__ == '__main__':
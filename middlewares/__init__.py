@@ -0,0 +1,6 @@
+from .outbound import OutboundScheduler
+from .fsm_flush import FSMFlushMiddleware
+from .user import UserMiddleware
+from .admin import AdminMiddleware
+from .unit_of_work import UnitOfWorkMiddleware
+from .media_group import MediaGroupMiddleware
@@ -0,0 +1,33 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.event.bases import SkipHandler
+from aiogram.types import TelegramObject
+
+from database.cache import admin_cache
+from database.crud import UserCrud
+
+
+class AdminMiddleware(BaseMiddleware):
+    """
+    Пропускает к хендлерам админских роутеров только администраторов.
+    Проверка идет по admin_cache в памяти, база читается не чаще раза в ADMIN_CACHE_TTL.
+    Для остальных хендлер пропускается (SkipHandler), и апдейт уходит
+    дальше — например, общий back_to_main из навигации.
+    """
+
+    def __init__(self):
+        self.cache = admin_cache
+        self.crud = UserCrud()
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: Dict[str, Any],
+    ) -> Any:
+        from_user = data.get("event_from_user")
+        if from_user is None or not await self.cache.is_admin(from_user.id, self.crud.get_admin_ids):
+            raise SkipHandler()
+
+        return await handler(event, data)
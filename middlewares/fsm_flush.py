@@ -0,0 +1,29 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from database.fsm_storage import SQLStorage
+
+
+class FSMFlushMiddleware(BaseMiddleware):
+    """
+    Сбрасывает изменения FSM одного апдейта в SQLStorage одной записью,
+    сколько бы update_data ни вызвал обработчик.
+    """
+
+    def __init__(self, storage: SQLStorage):
+        self.storage = storage
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: Dict[str, Any],
+    ) -> Any:
+        try:
+            return await handler(event, data)
+        finally:
+            state = data.get("state")
+            if state is not None:
+                await self.storage.flush(state.key)
@@ -0,0 +1,58 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from aiogram import BaseMiddleware
+from aiogram.types import Message, TelegramObject
+
+from settings import config
+
+
+class _AlbumBuffer:
+    __slots__ = ("messages", "updated_at")
+
+    def __init__(self, message: Message):
+        self.messages: List[Message] = [message]
+        self.updated_at = time.monotonic()
+
+
+class MediaGroupMiddleware(BaseMiddleware):
+    """
+    Собирает сообщения одного альбома (общий media_group_id) в один вызов хендлера.
+
+    Telegram присылает каждое фото альбома отдельным апдейтом. Первое сообщение
+    ждет, пока части альбома перестанут приходить дольше latency секунд, и вызывает
+    хендлер со списком всех сообщений в data["album"]; остальные хендлер не вызывают.
+    Сообщения без media_group_id проходят как обычно.
+    """
+
+    def __init__(self, latency: float = config.MEDIA_GROUP_LATENCY):
+        self.latency = latency
+        self._albums: Dict[Tuple[int, str], _AlbumBuffer] = {}
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: Dict[str, Any],
+    ) -> Any:
+        if not isinstance(event, Message) or not event.media_group_id:
+            return await handler(event, data)
+
+        key = (event.chat.id, event.media_group_id)
+        buffer = self._albums.get(key)
+        if buffer is not None:
+            buffer.messages.append(event)
+            buffer.updated_at = time.monotonic()
+            return None
+
+        buffer = self._albums[key] = _AlbumBuffer(event)
+        try:
+            # Каждая новая часть альбома продлевает ожидание
+            while (delay := buffer.updated_at + self.latency - time.monotonic()) > 0:
+                await asyncio.sleep(delay)
+        finally:
+            del self._albums[key]
+
+        data["album"] = sorted(buffer.messages, key=lambda message: message.message_id)
+        return await handler(event, data)
@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Union
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import (CopyMessages, ForwardMessages, Response, SendChatAction, SendMediaGroup,
+                             TelegramMethod)
+from aiogram.methods.base import TelegramType
+
+from settings import config
+
+# Методы, которые создают или меняют сообщения и попадают под лимиты Telegram
+THROTTLED_PREFIXES = ("Send", "Copy", "Forward", "Edit")
+
+
+class TokenBucket:
+    """
+    Token bucket: rate токенов в секунду, не больше capacity подряд.
+    Ожидающие обслуживаются по очереди (asyncio.Lock — FIFO).
+    """
+
+    __slots__ = ("rate", "capacity", "tokens", "updated_at", "paused_until", "lock")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self, cost: float = 1) -> None:
+        cost = min(cost, self.capacity)
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if self.paused_until > now:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+
+                self._refill(now)
+                if self.tokens >= cost:
+                    self.tokens -= cost
+                    return
+
+                await asyncio.sleep((cost - self.tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        # Все ожидающие ждут один и тот же дедлайн, а не повторяют запрос каждый сам по себе
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+    def is_idle(self, now: float) -> bool:
+        return not self.lock.locked() and self.tokens + (now - self.updated_at) * self.rate >= self.capacity
+
+
+class OutboundScheduler(BaseRequestMiddleware):
+    """
+    Middleware сессии бота: все исходящие отправки проходят через общий
+    лимит (~30 msg/s, по числу сообщений: фото альбома, копии copyMessages)
+    и лимит конкретного чата по числу отправок (~1 в секунду в группу,
+    burst на целую страницу каталога в личку). TelegramRetryAfter ставит чат на паузу и запрос
+    повторяется, вместо того чтобы обрывать вывод страницы на середине.
+    """
+
+    MAX_CHAT_BUCKETS = 10_000
+
+    def __init__(self,
+                 global_rate: float = config.SEND_GLOBAL_RATE,
+                 group_rate: float = config.SEND_GROUP_RATE,
+                 chat_rate: float = config.SEND_CHAT_RATE,
+                 chat_burst: int = config.SEND_CHAT_BURST,
+                 max_retries: int = config.SEND_MAX_RETRIES):
+        self.global_bucket = TokenBucket(rate=global_rate, capacity=global_rate)
+        self.group_rate = group_rate
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_retries = max_retries
+        self._chat_buckets: Dict[Union[int, str], TokenBucket] = {}
+        self._pending = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._pending
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self._pending,
+            "chats": len(self._chat_buckets),
+        }
+
+    def _chat_bucket(self, chat_id: Union[int, str]) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self._chat_buckets) >= self.MAX_CHAT_BUCKETS:
+                self._drop_idle_buckets()
+
+            is_group = isinstance(chat_id, str) or chat_id < 0
+            if is_group:
+                bucket = TokenBucket(rate=self.group_rate, capacity=self.group_rate)
+            else:
+                bucket = TokenBucket(rate=self.chat_rate, capacity=self.chat_burst)
+            self._chat_buckets[chat_id] = bucket
+        return bucket
+
+    def _drop_idle_buckets(self) -> None:
+        now = time.monotonic()
+        for chat_id in [chat_id for chat_id, bucket in self._chat_buckets.items() if bucket.is_idle(now)]:
+            del self._chat_buckets[chat_id]
+
+    @staticmethod
+    def _global_cost(method: TelegramMethod) -> int:
+        # Общий лимит считает сообщения: альбом из 5 фото — 5 сообщений, copyMessages — по числу копий
+        if isinstance(method, SendMediaGroup):
+            return len(method.media)
+        if isinstance(method, (CopyMessages, ForwardMessages)):
+            return len(method.message_ids)
+        return 1
+
+    async def __call__(
+            self,
+            make_request: NextRequestMiddlewareType[TelegramType],
+            bot: Bot,
+            method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        chat_id = getattr(method, "chat_id", None)
+        if (chat_id is None
+                or isinstance(method, SendChatAction)
+                or not type(method).__name__.startswith(THROTTLED_PREFIXES)):
+            return await make_request(bot, method)
+
+        chat_bucket = self._chat_bucket(chat_id)
+        # Лимит чата — на вызовы: альбом или пачка копий приходит в чат одной отправкой
+        global_cost = self._global_cost(method)
+
+        self._pending += 1
+        try:
+            for attempt in range(self.max_retries + 1):
+                await chat_bucket.acquire()
+                await self.global_bucket.acquire(global_cost)
+                try:
+                    return await make_request(bot, method)
+
+                except TelegramRetryAfter as exc:
+                    if attempt >= self.max_retries:
+                        raise
+
+                    logging.warning("Flood control в чате %s: пауза %s сек. (попытка %d)",
+                                    chat_id, exc.retry_after, attempt + 1)
+                    chat_bucket.pause(exc.retry_after)
+        finally:
+            self._pending -= 1
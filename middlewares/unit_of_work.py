@@ -0,0 +1,26 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from database.unit_of_work import UnitOfWork
+
+
+class UnitOfWorkMiddleware(BaseMiddleware):
+    """
+    Открывает UnitOfWork на время обработки апдейта. Доступен в хендлерах как uow.
+    Общей сессии на апдейт нет: вне блока каждый вызов CRUD открывает свою короткую
+    сессию чтения, а запись сразу фиксируется через write_queue. Несколько записей,
+    которые должны примениться вместе, хендлер сам оборачивает
+    в `async with uow.transaction():` — COMMIT на выходе из блока, ROLLBACK при ошибке.
+    """
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: Dict[str, Any],
+    ) -> Any:
+        with UnitOfWork() as uow:
+            data["uow"] = uow
+            return await handler(event, data)
@@ -0,0 +1,44 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from database.cache import user_cache
+from database.crud import UserCrud
+
+
+class UserMiddleware(BaseMiddleware):
+    """
+    Кладет в data["user"] запись User отправителя апдейта.
+    Известные пользователи берутся из user_cache без обращения к базе,
+    при промахе кеша — одним SELECT; запись в базу только для новых
+    пользователей и при смене имени.
+    """
+
+    def __init__(self):
+        self.cache = user_cache
+        self.crud = UserCrud()
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: Dict[str, Any],
+    ) -> Any:
+        from_user = data.get("event_from_user")
+        if from_user is None:
+            return await handler(event, data)
+
+        user = self.cache.get(from_user.id)
+        if user is None:
+            user = await self.crud.upsert_user(
+                telegram_id=from_user.id,
+                username=from_user.username,
+                first_name=from_user.first_name,
+                last_name=from_user.last_name,
+            )
+            if user is not None:
+                self.cache.set(from_user.id, user)
+
+        data["user"] = user
+        return await handler(event, data)
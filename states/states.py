@@ -16,3 +16,7 @@ class NewFurnitureStates(StatesGroup):
     kitchen_type = State()
     country = State()
     photos = State()
+
+
+class ImportCatalogStates(StatesGroup):
+    file = State()
@@ -0,0 +1,97 @@
+"""
+Тесты работают с отдельной базой: временный файл SQLite или Postgres из
+TEST_DATABASE_URL. DATABASE_URL из .env тестам не достается — engine создается
+при импорте database.engine, поэтому переменные выставляются до любых импортов бота.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_TMP_DIR = tempfile.mkdtemp(prefix="furniture-bot-tests-")
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL") or f"sqlite+aiosqlite:///{_TMP_DIR}/test.db"
+os.environ["DATABASE_READ_URL"] = ""
+# Тесты считают запросы к базе — кеши каталога и пользователей их бы прятали
+os.environ["CATALOG_CACHE_SIZE"] = "0"
+os.environ["USER_CACHE_SIZE"] = "0"
+
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+
+
+def alembic_config() -> Config:
+    config = Config(os.path.join(ROOT, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(ROOT, "alembic"))
+    return config
+
+
+def run(coro):
+    """Выполнить корутину в новом цикле и закрыть соединения, привязанные к нему."""
+    from database.engine import async_engine, read_engine
+    from database.write_queue import write_queue
+
+    async def wrapper():
+        try:
+            return await coro
+        finally:
+            await write_queue.close()
+            await async_engine.dispose()
+            await read_engine.dispose()
+
+    return asyncio.run(wrapper())
+
+
+@pytest.fixture
+def migrated_db():
+    """Схема из миграций (а не create_all), после теста база пустая."""
+    config = alembic_config()
+    command.upgrade(config, "head")
+    yield
+    command.downgrade(config, "base")
+
+
+CATEGORIES = ("🛋️ Мягкая мебель", "🍳 Кухонная мебель", "🚪 Шкафы")
+COUNTRIES = ("🇷🇺 Россия", "🇹🇷 Турция")
+KITCHEN_TYPES = ("📏 Прямая кухня", "📐 Угловая кухня")
+
+
+async def _seed():
+    from sqlalchemy import insert
+
+    from database.engine import async_engine
+    from database.models import Category, Cooperation, Furniture, FurniturePhoto, User
+
+    async with async_engine.begin() as connection:
+        await connection.execute(insert(Category), [{"name": name, "description": name} for name in CATEGORIES])
+        await connection.execute(insert(Furniture), [
+            {
+                "description": f"Товар {index} диван кухня шкаф",
+                "category_name": CATEGORIES[index % len(CATEGORIES)],
+                "country_origin": COUNTRIES[index % len(COUNTRIES)],
+                "subcategory": KITCHEN_TYPES[index % 2] if index % len(CATEGORIES) == 1 else None,
+            }
+            for index in range(1, 301)
+        ])
+        await connection.execute(insert(FurniturePhoto), [
+            {"furniture_id": furniture_id, "file_id": f"photo-{furniture_id}-{number}"}
+            for furniture_id in range(1, 301) for number in range(3)
+        ])
+        await connection.execute(insert(User), [
+            {"id": f"user-{telegram_id}", "telegram_id": telegram_id, "username": f"user{telegram_id}"}
+            for telegram_id in range(1, 51)
+        ])
+        await connection.execute(insert(Cooperation), [
+            {"telegram_id": telegram_id, "username": f"user{telegram_id}", "text_requests": "Хочу сотрудничать"}
+            for telegram_id in range(1, 51)
+        ])
+
+
+@pytest.fixture
+def seeded_db(migrated_db):
+    """Каталог из 300 товаров (по 3 фото), 50 пользователей и 50 заявок."""
+    run(_seed())
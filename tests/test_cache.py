@@ -0,0 +1,103 @@
+"""Кеш каталога: в него не попадают незакоммиченные строки и устаревшие после инвалидации чтения."""
+import pytest
+from sqlalchemy import event
+
+from conftest import run
+from database import crud
+from database.cache import CatalogCache, catalog_tag, furniture_tag
+from database.crud import CrudFurniture
+from database.engine import read_engine
+from database.unit_of_work import UnitOfWork
+
+SOFA = ("🛋️ Мягкая мебель", "🇷🇺 Россия")
+
+
+class RolledBack(Exception):
+    pass
+
+
+@pytest.fixture
+def catalog_cache(monkeypatch):
+    cache = CatalogCache(max_size=100, ttl=300)
+    monkeypatch.setattr(crud, "catalog_cache", cache)
+    return cache
+
+
+def test_transaction_reads_bypass_cache(migrated_db, catalog_cache):
+    async def scenario():
+        with UnitOfWork() as uow:
+            try:
+                async with uow.transaction():
+                    await CrudFurniture().create_furniture("Диван", *SOFA)
+                    inside = await CrudFurniture().count_furniture(*SOFA)
+                    raise RolledBack()
+            except RolledBack:
+                pass
+            return inside, await CrudFurniture().count_furniture(*SOFA)
+
+    inside, after_rollback = run(scenario())
+
+    assert inside == 1
+    assert after_rollback == 0
+
+
+def test_invalidate_tag_drops_only_tagged_keys():
+    cache = CatalogCache(max_size=10)
+    cache.set("page", [1, 2], tags=[furniture_tag(1), furniture_tag(2)])
+    cache.set("count", 2, tags=[catalog_tag(*SOFA)])
+    cache.set("other", 5, tags=[furniture_tag(3)])
+
+    assert cache.invalidate_tag(furniture_tag(2)) == 1
+
+    assert cache.get("page") is None
+    assert cache.get("count") == 2
+    assert cache.get("other") == 5
+
+
+def test_set_after_invalidation_of_its_tag_is_dropped():
+    cache = CatalogCache(max_size=10)
+    generation = cache.generation()
+    # Пока шел запрос в базу, товар изменили
+    cache.invalidate_tag(catalog_tag(*SOFA))
+
+    cache.set("count", 1, tags=[catalog_tag(*SOFA)], generation=generation)
+    cache.set("other", 5, tags=[furniture_tag(3)], generation=generation)
+
+    assert cache.get("count") is None
+    assert cache.get("other") == 5
+
+
+def test_set_is_dropped_when_invalidation_marks_were_evicted():
+    cache = CatalogCache(max_size=2)
+    generation = cache.generation()
+    for furniture_id in range(5):
+        cache.invalidate_tag(furniture_tag(furniture_id))
+
+    cache.set("page", [9], tags=[furniture_tag(9)], generation=generation)
+
+    assert cache.get("page") is None
+
+
+def test_clear_drops_pending_sets():
+    cache = CatalogCache(max_size=10)
+    generation = cache.generation()
+    cache.clear()
+
+    cache.set("count", 1, tags=[catalog_tag(*SOFA)], generation=generation)
+
+    assert cache.get("count") is None
+
+
+def test_invalidation_during_query_is_not_lost(seeded_db, catalog_cache):
+    def invalidate(*args):
+        catalog_cache.invalidate_tag(catalog_tag(*SOFA))
+
+    event.listen(read_engine.sync_engine, "before_cursor_execute", invalidate)
+    try:
+        run(CrudFurniture().count_furniture(*SOFA))
+    finally:
+        event.remove(read_engine.sync_engine, "before_cursor_execute", invalidate)
+
+    assert catalog_cache.get(("count", *SOFA, None)) is None
+    run(CrudFurniture().count_furniture(*SOFA))
+    assert catalog_cache.get(("count", *SOFA, None)) == 50
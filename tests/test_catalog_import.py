@@ -0,0 +1,79 @@
+"""Импорт каталога: имена фото с пробелами и загрузка из ZIP-архива."""
+import shutil
+import zipfile
+from types import SimpleNamespace
+
+from sqlalchemy import select
+
+from conftest import CATEGORIES, COUNTRIES, run
+from database.crud import CrudCategory
+from database.engine import AsyncReadSessionLocal
+from database.models import Furniture
+from handlers.admin.import_catalog_handler import run_import
+from settings import config
+from utils.catalog_import import RowValidator
+
+
+def _validator():
+    return RowValidator(categories=CATEGORIES, countries=COUNTRIES, kitchen_types=(), max_photos=10,
+                        default_country=COUNTRIES[0])
+
+
+def test_photo_names_may_contain_spaces():
+    row, errors = _validator().validate(2, {
+        "description": "Шкаф-купе",
+        "category": "шкафы",
+        "country": "Россия",
+        "photos": "фото 1.jpg | фото 2.jpg||AgACAgIAAxkBAAI",
+    })
+
+    assert errors == []
+    assert row.photos == ["фото 1.jpg", "фото 2.jpg", "AgACAgIAAxkBAAI"]
+
+
+class FakeBot:
+    """Скачивание файла — копия с диска, отправка фото выдает file_id по имени файла."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.uploaded = []
+
+    async def download(self, file_id, destination):
+        shutil.copy(self.path, destination)
+
+    async def send_photo(self, chat_id, photo, **kwargs):
+        self.uploaded.append((chat_id, photo.filename, len(photo.data)))
+        return SimpleNamespace(message_id=len(self.uploaded), photo=[SimpleNamespace(file_id=f"id:{photo.filename}")])
+
+    async def delete_message(self, chat_id, message_id):
+        pass
+
+    async def edit_message_text(self, **kwargs):
+        self.report = kwargs["text"]
+
+    async def send_document(self, *args, **kwargs):
+        pass
+
+
+def test_zip_import_uploads_photos_with_spaces(migrated_db, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "CATALOG_CHANNEL_ID", None)
+    archive = tmp_path / "catalog.zip"
+    with zipfile.ZipFile(archive, "w") as zip_file:
+        zip_file.writestr("catalog.csv", "description;category;country;photos\n"
+                                         "Шкаф-купе;🚪 Шкафы;🇷🇺 Россия;фото 1.jpg|images/фото 2.jpg\n")
+        zip_file.writestr("images/фото 1.jpg", b"jpeg-1")
+        zip_file.writestr("images/фото 2.jpg", b"jpeg-22")
+    bot = FakeBot(str(archive))
+
+    async def scenario():
+        await CrudCategory().create_category("🚪 Шкафы", "Шкафы")
+        await run_import(bot, chat_id=7, progress_message_id=1, file_id="file", filename="catalog.zip")
+        async with AsyncReadSessionLocal() as session:
+            result = await session.execute(select(Furniture.description))
+            return list(result.scalars())
+
+    descriptions = run(scenario())
+
+    assert descriptions == ["Шкаф-купе"]
+    assert bot.uploaded == [(7, "фото 1.jpg", 6), (7, "фото 2.jpg", 7)]
+    assert "Добавлено: 1" in bot.report
@@ -0,0 +1,127 @@
+"""Страница каталога уходит в порядке товаров, даже если часть карточек копируется из канала."""
+from types import SimpleNamespace
+
+from conftest import run
+from database.models import Furniture
+from handlers.backend.furniture_handlers.furniture_card import (FurnitureCard, copy_cards_from_channel,
+                                                                publish_card_to_channel, send_card_album,
+                                                                send_catalog_page)
+from settings import config
+
+
+class FakeMessage:
+    """Записывает, что и в каком порядке бот отправил в чат."""
+
+    def __init__(self, fail_on_copy: int = None):
+        self.chat = SimpleNamespace(id=1)
+        self.bot = SimpleNamespace(copy_messages=self._copy_messages)
+        self.sent = []
+        self._fail_on_copy = fail_on_copy
+        self._copies = 0
+
+    async def _copy_messages(self, chat_id, from_chat_id, message_ids):
+        self._copies += 1
+        if self._copies == self._fail_on_copy:
+            raise RuntimeError("copyMessages недоступен")
+        self.sent.append(("copy", list(message_ids)))
+
+    async def answer(self, text, **kwargs):
+        shown = [furniture_id for furniture_id in range(1, 100) if f"Товар {furniture_id}\n" in text]
+        self.sent.append(("text", shown))
+
+    async def answer_photo(self, photo, caption=None, **kwargs):
+        self.sent.append(("photo", [photo]))
+
+    async def answer_media_group(self, media, **kwargs):
+        if not 2 <= len(media) <= 10:
+            raise RuntimeError("альбом должен содержать от 2 до 10 фото")
+        self.sent.append(("album", [item.media for item in media]))
+
+
+def _furniture(furniture_id: int, channel_message_ids: str = None) -> Furniture:
+    return Furniture(id=furniture_id, description=f"Товар {furniture_id}", category_name="🚪 Шкафы",
+                     country_origin="🇷🇺 Россия", channel_message_ids=channel_message_ids, photos=[])
+
+
+def test_mixed_page_keeps_catalog_order(monkeypatch):
+    monkeypatch.setattr(config, "CATALOG_CHANNEL_ID", -100)
+    page = [_furniture(1, "10,11"), _furniture(2, "12"), _furniture(3), _furniture(4, "13"), _furniture(5)]
+    message = FakeMessage()
+
+    run(send_catalog_page(message, page, "🚪 Шкафы"))
+
+    assert message.sent == [("copy", [10, 11, 12]), ("text", [3]), ("copy", [13]), ("text", [5])]
+
+
+def test_copy_splits_where_channel_order_differs():
+    # Товар 2 переопубликован позже товара 3 — copyMessages требует возрастающие id
+    page = [_furniture(1, "10"), _furniture(2, "30"), _furniture(3, "20")]
+    message = FakeMessage()
+
+    assert run(copy_cards_from_channel(message, page)) == [1, 2, 3]
+    assert message.sent == [("copy", [10, 30]), ("copy", [20])]
+
+
+def test_failed_copy_renders_only_undelivered_cards(monkeypatch):
+    monkeypatch.setattr(config, "CATALOG_CHANNEL_ID", -100)
+    page = [_furniture(1, "10"), _furniture(2, "5"), _furniture(3, "6")]
+    message = FakeMessage(fail_on_copy=2)
+
+    run(send_catalog_page(message, page, "🚪 Шкафы"))
+
+    assert message.sent == [("copy", [10]), ("text", [2, 3])]
+
+
+def test_single_photo_card_is_sent_as_photo():
+    message = FakeMessage()
+
+    run(send_card_album(message, FurnitureCard(text="Шкаф", photo_ids=["photo-1"]), caption="Шкаф"))
+    run(send_card_album(message, FurnitureCard(text="Шкаф", photo_ids=["photo-1", "photo-2"])))
+
+    assert message.sent == [("photo", ["photo-1"]), ("album", ["photo-1", "photo-2"])]
+
+
+class FakeBot:
+    """Записывает вызовы Bot API и выдает сообщениям канала id по порядку."""
+
+    def __init__(self):
+        self.calls = []
+        self._next_id = 100
+
+    def _sent(self):
+        self._next_id += 1
+        return SimpleNamespace(message_id=self._next_id)
+
+    async def send_photo(self, chat_id, photo, caption=None):
+        self.calls.append(("send_photo", [photo], caption))
+        return self._sent()
+
+    async def send_media_group(self, chat_id, media):
+        if not 2 <= len(media) <= 10:
+            raise RuntimeError("альбом должен содержать от 2 до 10 фото")
+        self.calls.append(("send_media_group", [item.media for item in media], media[0].caption))
+        return [self._sent() for _ in media]
+
+    async def send_message(self, chat_id, text, **kwargs):
+        self.calls.append(("send_message", [], text))
+        return self._sent()
+
+
+def test_publish_single_photo_card_as_photo(monkeypatch):
+    monkeypatch.setattr(config, "CATALOG_CHANNEL_ID", -100)
+    bot = FakeBot()
+
+    message_ids = run(publish_card_to_channel(bot, FurnitureCard(text="Шкаф", photo_ids=["photo-1"])))
+
+    assert message_ids == [101]
+    assert bot.calls == [("send_photo", ["photo-1"], "Шкаф")]
+
+
+def test_publish_album_card(monkeypatch):
+    monkeypatch.setattr(config, "CATALOG_CHANNEL_ID", -100)
+    bot = FakeBot()
+
+    message_ids = run(publish_card_to_channel(bot, FurnitureCard(text="Шкаф", photo_ids=["photo-1", "photo-2"])))
+
+    assert message_ids == [101, 102]
+    assert bot.calls == [("send_media_group", ["photo-1", "photo-2"], "Шкаф")]
@@ -0,0 +1,113 @@
+"""SQLStorage: изменения апдейта копятся в памяти и пишутся в flush() одним запросом."""
+from aiogram.fsm.storage.base import StorageKey
+from sqlalchemy import event, select
+
+from conftest import run
+from database.engine import AsyncReadSessionLocal, async_engine
+from database.fsm_storage import SQLStorage
+from database.models import FSMState
+from database.write_queue import write_queue
+
+KEY = StorageKey(bot_id=1, chat_id=42, user_id=42)
+
+
+class RecordingWriter:
+    """write_queue, который перед записью дает выполнить before_write — «параллельный» апдейт."""
+
+    def __init__(self, before_write=None):
+        self.before_write = before_write
+        self.submits = 0
+
+    async def submit(self, operation):
+        self.submits += 1
+        if self.before_write is not None:
+            await self.before_write()
+        return await write_queue.submit(operation)
+
+
+def _capture_writes(statements):
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE")):
+            statements.append(statement.lstrip().split()[0].upper())
+    return before_cursor_execute
+
+
+async def _stored_row():
+    async with AsyncReadSessionLocal() as session:
+        result = await session.execute(select(FSMState.state, FSMState.data))
+        return result.all()
+
+
+def _run_with_writes(scenario):
+    statements = []
+    listener = _capture_writes(statements)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        result = run(scenario())
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+    return statements, result
+
+
+def test_update_changes_are_flushed_as_one_upsert(migrated_db):
+    writer = RecordingWriter()
+
+    async def scenario():
+        storage = SQLStorage(writer=writer)
+        await storage.set_state(KEY, "NewFurnitureStates:description")
+        await storage.update_data(KEY, {"description": "Шкаф"})
+        await storage.update_data(KEY, {"category": "🚪 Шкафы"})
+        await storage.set_state(KEY, "NewFurnitureStates:photos")
+        await storage.flush(KEY)
+        await storage.close()
+
+    statements, _ = _run_with_writes(scenario)
+
+    assert writer.submits == 1
+    assert statements == ["INSERT"]
+    assert run(_stored_row()) == [("NewFurnitureStates:photos", '{"description": "Шкаф", "category": "🚪 Шкафы"}')]
+
+
+def test_changes_made_during_write_are_kept(migrated_db):
+    async def scenario():
+        storage = SQLStorage()
+
+        async def concurrent_update():
+            await storage.update_data(KEY, {"photos": ["photo-1"]})
+
+        storage.writer = RecordingWriter(before_write=concurrent_update)
+        await storage.set_state(KEY, "NewFurnitureStates:photos")
+        await storage.flush(KEY)
+        kept = await storage.get_data(KEY)
+
+        storage.writer = RecordingWriter()
+        await storage.flush(KEY)
+        await storage.close()
+        return kept
+
+    kept = run(scenario())
+
+    # Первый flush записал снимок до изменения, но не выбросил само изменение
+    assert kept == {"photos": ["photo-1"]}
+    assert run(_stored_row()) == [("NewFurnitureStates:photos", '{"photos": ["photo-1"]}')]
+
+
+def test_clear_becomes_delete(migrated_db):
+    async def saved():
+        storage = SQLStorage()
+        await storage.set_state(KEY, "NewFurnitureStates:photos")
+        await storage.update_data(KEY, {"photos": ["photo-1"]})
+        await storage.close()
+
+    async def cleared():
+        storage = SQLStorage()
+        await storage.set_state(KEY, None)
+        await storage.set_data(KEY, {})
+        await storage.flush(KEY)
+        await storage.close()
+
+    run(saved())
+    statements, _ = _run_with_writes(cleared)
+
+    assert statements == ["DELETE"]
+    assert run(_stored_row()) == []
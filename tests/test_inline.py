@@ -0,0 +1,47 @@
+"""Inline-режим: кешированная выдача обновляется после изменения каталога."""
+import pytest
+from aiogram import types
+
+from conftest import run
+from database import crud
+from database.cache import CatalogCache
+from database.crud import CrudFurniture
+from handlers.backend.furniture_handlers import inline_handler
+
+WARDROBE = ("🚪 Шкафы", "🇷🇺 Россия")
+
+
+@pytest.fixture
+def inline_cache(monkeypatch):
+    cache = CatalogCache(max_size=100, ttl=300)
+    monkeypatch.setattr(crud, "inline_cache", cache)
+    monkeypatch.setattr(inline_handler, "inline_cache", cache)
+    return cache
+
+
+def test_new_furniture_shows_up_in_cached_results(migrated_db, inline_cache):
+    async def scenario():
+        await CrudFurniture().create_furniture("Шкаф-купе", *WARDROBE)
+        before, _ = await inline_handler.get_inline_results("шкаф")
+        await CrudFurniture().create_furniture("Шкаф распашной", *WARDROBE)
+        after, _ = await inline_handler.get_inline_results("шкаф")
+        return before, after
+
+    before, after = run(scenario())
+
+    assert len(before) == 1
+    assert len(after) == 2
+
+
+def test_added_photos_refresh_cached_result(migrated_db, inline_cache):
+    async def scenario():
+        furniture = await CrudFurniture().create_furniture("Шкаф-купе", *WARDROBE)
+        before, _ = await inline_handler.get_inline_results("шкаф")
+        await CrudFurniture().add_photos_to_furniture(furniture.id, ["photo-1"])
+        after, _ = await inline_handler.get_inline_results("шкаф")
+        return before, after
+
+    before, after = run(scenario())
+
+    assert isinstance(before[0], types.InlineQueryResultArticle)
+    assert isinstance(after[0], types.InlineQueryResultCachedPhoto)
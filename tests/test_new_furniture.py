@@ -0,0 +1,71 @@
+"""Новая мебель и ее фото сохраняются одной транзакцией: все или ничего."""
+from types import SimpleNamespace
+
+from sqlalchemy import func, select
+
+from conftest import run
+from database.engine import AsyncReadSessionLocal
+from database.models import Furniture, FurniturePhoto
+from database.unit_of_work import UnitOfWork
+from handlers.admin.new_furniture_handler import get_photos
+from settings import config
+
+
+class FakeState:
+    def __init__(self, data: dict):
+        self.data = data
+
+    async def get_data(self):
+        return dict(self.data)
+
+    async def update_data(self, **kwargs):
+        self.data.update(kwargs)
+
+    async def clear(self):
+        self.data = {}
+
+
+class FakeMessage:
+    text = "✅ Завершить добавление"
+
+    def __init__(self):
+        self.answers = []
+
+    async def answer(self, text, **kwargs):
+        self.answers.append(text)
+
+
+async def _finish(photos):
+    state = FakeState({
+        "description_new_furniture": "Шкаф-купе",
+        "category_name": "🚪 Шкафы",
+        "country_name": "🇷🇺 Россия",
+        "photos": photos,
+    })
+    message = FakeMessage()
+    with UnitOfWork() as uow:
+        await get_photos(message, state, uow)
+
+    async with AsyncReadSessionLocal() as session:
+        furniture = (await session.execute(select(func.count(Furniture.id)))).scalar_one()
+        photos = (await session.execute(select(func.count(FurniturePhoto.id)))).scalar_one()
+    return message.answers, furniture, photos
+
+
+def test_furniture_saved_with_photos(migrated_db, monkeypatch):
+    monkeypatch.setattr(config, "CATALOG_CHANNEL_ID", None)
+
+    answers, furniture, photos = run(_finish(["photo-1", "photo-2"]))
+
+    assert (furniture, photos) == (1, 2)
+    assert "Мебель успешно добавлена" in answers[-1]
+
+
+def test_failed_photos_roll_back_furniture(migrated_db, monkeypatch):
+    monkeypatch.setattr(config, "CATALOG_CHANNEL_ID", None)
+
+    # file_id NOT NULL — вставка фото падает внутри SAVEPOINT
+    answers, furniture, photos = run(_finish(["photo-1", None]))
+
+    assert (furniture, photos) == (0, 0)
+    assert answers == [answers[0]] and "Ошибка сохранения" in answers[0]
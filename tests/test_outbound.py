@@ -0,0 +1,138 @@
+"""Лимиты исходящих отправок на поддельных часах: время идет только когда планировщик спит."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import SendMediaGroup, SendMessage
+from aiogram.types import InputMediaPhoto
+
+from middlewares import outbound
+from middlewares.outbound import OutboundScheduler, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(round(seconds, 6))
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(outbound, "time", clock)
+    monkeypatch.setattr(outbound, "asyncio", SimpleNamespace(Lock=asyncio.Lock, sleep=clock.sleep))
+    return clock
+
+
+class FakeTelegram:
+    """make_request: записывает время отправок и отвечает flood control заданное число раз."""
+
+    def __init__(self, clock: FakeClock, retry_after: int = 0, failures: int = 0):
+        self.clock = clock
+        self.retry_after = retry_after
+        self.failures = failures
+        self.sent = []
+
+    async def __call__(self, bot, method):
+        if self.failures:
+            self.failures -= 1
+            raise TelegramRetryAfter(method=method, message="Too Many Requests", retry_after=self.retry_after)
+        self.sent.append((round(self.clock.now - 1000.0, 6), method.chat_id))
+        return True
+
+
+def _message(chat_id):
+    return SendMessage(chat_id=chat_id, text="Карточка")
+
+
+def test_bucket_spends_burst_then_refills(clock):
+    async def scenario():
+        bucket = TokenBucket(rate=2, capacity=2)
+        await bucket.acquire()
+        await bucket.acquire()
+        assert clock.sleeps == []
+
+        await bucket.acquire()
+        assert clock.sleeps == [0.5]
+
+        clock.now += 1
+        await bucket.acquire()
+        await bucket.acquire()
+        assert clock.sleeps == [0.5]
+
+    asyncio.run(scenario())
+
+
+def test_private_chat_gets_burst_then_chat_rate(clock):
+    scheduler = OutboundScheduler(global_rate=30, group_rate=1, chat_rate=1, chat_burst=3, max_retries=0)
+    telegram = FakeTelegram(clock)
+
+    async def scenario():
+        for _ in range(5):
+            await scheduler(telegram, None, _message(7))
+
+    asyncio.run(scenario())
+
+    assert [at for at, _ in telegram.sent] == [0, 0, 0, 1, 2]
+
+
+def test_chats_are_limited_independently(clock):
+    scheduler = OutboundScheduler(global_rate=30, group_rate=1, chat_rate=1, chat_burst=1, max_retries=0)
+    telegram = FakeTelegram(clock)
+
+    async def scenario():
+        await scheduler(telegram, None, _message(-100))
+        await scheduler(telegram, None, _message(7))
+        await scheduler(telegram, None, _message(-100))
+
+    asyncio.run(scenario())
+
+    assert telegram.sent == [(0, -100), (0, 7), (1, -100)]
+
+
+def test_global_limit_counts_album_photos(clock):
+    scheduler = OutboundScheduler(global_rate=5, group_rate=1, chat_rate=1, chat_burst=20, max_retries=0)
+    telegram = FakeTelegram(clock)
+    album = SendMediaGroup(chat_id=7, media=[InputMediaPhoto(media=f"photo-{n}") for n in range(5)])
+
+    async def scenario():
+        await scheduler(telegram, None, album)
+        # Другой чат, свой лимит свободен — ждет только общий лимит, потраченный альбомом
+        await scheduler(telegram, None, _message(8))
+
+    asyncio.run(scenario())
+
+    assert telegram.sent == [(0, 7), (0.2, 8)]
+
+
+def test_retry_after_pauses_the_chat_for_all_waiters(clock):
+    scheduler = OutboundScheduler(global_rate=30, group_rate=1, chat_rate=1, chat_burst=20, max_retries=1)
+    telegram = FakeTelegram(clock, retry_after=3, failures=1)
+
+    async def scenario():
+        await asyncio.gather(scheduler(telegram, None, _message(7)), scheduler(telegram, None, _message(7)))
+
+    asyncio.run(scenario())
+
+    # Обе отправки ждут один общий дедлайн паузы, а не повторяют запрос по отдельности
+    assert telegram.sent == [(3, 7), (3, 7)]
+    assert scheduler.queue_depth == 0
+
+
+def test_retry_after_is_raised_when_retries_run_out(clock):
+    scheduler = OutboundScheduler(global_rate=30, group_rate=1, chat_rate=1, chat_burst=20, max_retries=1)
+    telegram = FakeTelegram(clock, retry_after=3, failures=2)
+
+    with pytest.raises(TelegramRetryAfter):
+        asyncio.run(scheduler(telegram, None, _message(7)))
+
+    assert telegram.sent == []
@@ -0,0 +1,26 @@
+"""Страница каталога — два запроса: товары и одним IN все их фото (без N+1)."""
+from sqlalchemy import event
+
+from conftest import CATEGORIES, COUNTRIES, run
+from database.crud import CrudFurniture
+from database.engine import async_engine, read_engine
+
+
+def test_furniture_page_costs_two_statements(seeded_db):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engines = (async_engine.sync_engine, read_engine.sync_engine)
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        page = run(CrudFurniture().get_furniture_page(CATEGORIES[0], COUNTRIES[0], limit=10))
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    assert len(page) == 10
+    assert all(len(furniture.photos) == 3 for furniture in page)
+    assert len(statements) == 2, "\n\n".join(statements)
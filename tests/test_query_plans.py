@@ -0,0 +1,76 @@
+"""
+EXPLAIN QUERY PLAN для горячих запросов: SQL перехватывается у настоящих
+методов CRUD, поэтому тест следит за теми запросами, которые бот реально шлет.
+Полный проход по таблице (SCAN без индекса) — падение теста.
+"""
+import sqlite3
+
+import pytest
+from sqlalchemy import event
+
+from conftest import CATEGORIES, COUNTRIES, KITCHEN_TYPES, run
+from database.crud import CrudCategory, CrudCooperation, CrudFurniture, UserCrud
+from database.engine import DATABASE_URL, async_engine, read_engine
+
+pytestmark = pytest.mark.skipif(DATABASE_URL.get_backend_name() != "sqlite",
+                                reason="EXPLAIN QUERY PLAN — синтаксис SQLite")
+
+SOFT, KITCHEN = CATEGORIES[0], CATEGORIES[1]
+RUSSIA = COUNTRIES[0]
+
+HOT_QUERIES = {
+    "catalog_page": lambda: CrudFurniture().get_furniture_page(SOFT, RUSSIA),
+    "catalog_next_page": lambda: CrudFurniture().get_furniture_page(SOFT, RUSSIA, after_id=30),
+    "catalog_subcategory_page": lambda: CrudFurniture().get_furniture_page(KITCHEN, RUSSIA, KITCHEN_TYPES[0],
+                                                                           after_id=10),
+    "catalog_before": lambda: CrudFurniture().get_furniture_before(SOFT, RUSSIA, before_id=100),
+    "catalog_count": lambda: CrudFurniture().count_furniture(SOFT, RUSSIA),
+    "catalog_subcategory_count": lambda: CrudFurniture().count_furniture(KITCHEN, RUSSIA, KITCHEN_TYPES[1]),
+    "furniture_with_photos": lambda: CrudFurniture().get_furniture_by_id(42),
+    "category_by_name": lambda: CrudCategory().check_category_by_name(SOFT),
+    "user_by_telegram_id": lambda: UserCrud().get_user_by_telegram_id(7),
+    "inbox_page": lambda: CrudCooperation().get_requests_page(limit=11),
+    "inbox_next_page": lambda: CrudCooperation().get_requests_page(after_id=10, limit=11),
+    "inbox_prev_page": lambda: CrudCooperation().get_requests_page(before_id=30, limit=11),
+    "inbox_count": lambda: CrudCooperation().count_requests(),
+    "inline_categories": lambda: CrudFurniture().get_furniture_by_categories([SOFT, KITCHEN], after_id=20),
+    "inline_search": lambda: CrudFurniture().search_furniture("диван"),
+    "inline_search_count": lambda: CrudFurniture().count_search_results("диван"),
+}
+
+
+def _capture(name):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    engines = (async_engine.sync_engine, read_engine.sync_engine)
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        run(HOT_QUERIES[name]())
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+def _full_scans(statement, parameters):
+    connection = sqlite3.connect(DATABASE_URL.database)
+    try:
+        plan = connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ()).fetchall()
+    finally:
+        connection.close()
+    # SCAN по виртуальной таблице FTS5 — это поиск по ее индексу, а не проход по строкам
+    return [row[-1] for row in plan if row[-1].startswith("SCAN") and "VIRTUAL TABLE" not in row[-1]]
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_index(seeded_db, name):
+    statements = _capture(name)
+    assert statements, f"{name}: запрос не дошел до базы"
+
+    for statement, parameters in statements:
+        assert not _full_scans(statement, parameters), f"{name}: полный проход в\n{statement}"
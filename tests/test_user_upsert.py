@@ -0,0 +1,65 @@
+"""upsert_user: известный пользователь с прежним именем не занимает писателя."""
+from sqlalchemy import event, insert
+
+from conftest import run
+from database.crud import UserCrud
+from database.engine import async_engine
+from database.models import User
+
+
+def _writes(scenario):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE")):
+            statements.append(statement.lstrip().split()[0].upper())
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        result = run(scenario())
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    return statements, result
+
+
+def test_new_user_is_inserted(migrated_db):
+    statements, user = _writes(lambda: UserCrud().upsert_user(7, "ivan", "Иван", None))
+
+    assert statements == ["INSERT"]
+    assert (user.telegram_id, user.username, user.is_admin) == (7, "ivan", False)
+
+
+def test_known_user_with_same_name_is_not_written(migrated_db):
+    run(UserCrud().upsert_user(7, "ivan", "Иван", None))
+
+    statements, user = _writes(lambda: UserCrud().upsert_user(7, "ivan", "Иван", None))
+
+    assert statements == []
+    assert user.username == "ivan"
+
+
+def test_changed_name_is_updated(migrated_db):
+    run(UserCrud().upsert_user(7, "ivan", "Иван", None))
+
+    statements, user = _writes(lambda: UserCrud().upsert_user(7, "ivan_petrov", "Иван", "Петров"))
+
+    assert statements == ["UPDATE"]
+    assert (user.username, user.lastname) == ("ivan_petrov", "Петров")
+
+
+def test_user_added_concurrently_falls_back_to_select(migrated_db, monkeypatch):
+    async def scenario():
+        async with async_engine.begin() as connection:
+            await connection.execute(insert(User).values(id="user-7", telegram_id=7, username="ivan",
+                                                         firstname="Иван", is_admin=True))
+
+        async def not_found_yet(self, telegram_id):
+            return None
+
+        # Параллельный апдейт добавил пользователя между SELECT и INSERT
+        monkeypatch.setattr(UserCrud, "get_user_by_telegram_id", not_found_yet)
+        return await UserCrud().upsert_user(7, "ivan", "Иван", None)
+
+    user = run(scenario())
+
+    assert (user.id, user.is_admin) == ("user-7", True)
@@ -0,0 +1,107 @@
+"""Очередь записей: пачки в одной транзакции, SAVEPOINT на операцию, защита от взаимной блокировки."""
+import asyncio
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+from conftest import run
+from database.engine import DATABASE_URL, AsyncReadSessionLocal
+from database.models import Category
+from database.write_queue import WriteQueue
+
+
+def _add_category(name: str):
+    async def write(session):
+        await session.execute(insert(Category).values(name=name, description=name))
+        return name
+    return write
+
+
+async def _category_names():
+    async with AsyncReadSessionLocal() as session:
+        result = await session.execute(select(Category.name).order_by(Category.id))
+        return list(result.scalars())
+
+
+def test_concurrent_writes_share_one_batch(migrated_db):
+    async def scenario():
+        queue = WriteQueue(max_batch=10, max_delay=0.01)
+        results = await asyncio.gather(*(queue.submit(_add_category(f"Категория {n}")) for n in range(5)))
+        await queue.close()
+        return queue, results
+
+    queue, results = run(scenario())
+
+    assert results == [f"Категория {n}" for n in range(5)]
+    assert (queue.batches, queue.writes) == (1, 5)
+    assert run(_category_names()) == results
+
+
+def test_batch_size_is_limited(migrated_db):
+    async def scenario():
+        queue = WriteQueue(max_batch=2, max_delay=0)
+        await asyncio.gather(*(queue.submit(_add_category(f"Категория {n}")) for n in range(5)))
+        await queue.close()
+        return queue
+
+    queue = run(scenario())
+
+    assert (queue.batches, queue.writes) == (3, 5)
+
+
+def test_failed_operation_rolls_back_only_itself(migrated_db):
+    async def scenario():
+        queue = WriteQueue(max_batch=10, max_delay=0.01)
+        results = await asyncio.gather(
+            queue.submit(_add_category("Шкафы")),
+            queue.submit(_add_category("Шкафы")),  # дубль уникального имени
+            queue.submit(_add_category("Кровати")),
+            return_exceptions=True,
+        )
+        await queue.close()
+        return queue, results
+
+    queue, results = run(scenario())
+
+    assert results[0] == "Шкафы" and results[2] == "Кровати"
+    assert isinstance(results[1], IntegrityError)
+    assert queue.batches == 1
+    assert run(_category_names()) == ["Шкафы", "Кровати"]
+
+
+def test_owner_writes_inside_acquired_transaction(migrated_db):
+    async def scenario():
+        queue = WriteQueue(max_delay=0)
+        session = await queue.acquire()
+        await queue.submit(_add_category("Шкафы"))
+        await queue.release(session, commit=False)
+        await queue.close()
+        return queue
+
+    queue = run(scenario())
+
+    # Запись шла в захваченной транзакции, а не в пачке очереди, и откатилась вместе с ней
+    assert queue.batches == 0
+    assert run(_category_names()) == []
+
+
+@pytest.mark.skipif(DATABASE_URL.get_backend_name() != "sqlite",
+                    reason="в Postgres транзакция и очередь пишут параллельно")
+def test_child_task_write_inside_transaction_raises(migrated_db):
+    async def scenario():
+        queue = WriteQueue(max_delay=0)
+        session = await queue.acquire()
+        try:
+            with pytest.raises(RuntimeError, match="взаимной блокировке"):
+                await asyncio.wait_for(asyncio.create_task(queue.submit(_add_category("Шкафы"))), timeout=5)
+        finally:
+            await queue.release(session, commit=True)
+
+        # После release дочерние задачи снова пишут через очередь
+        await asyncio.create_task(queue.submit(_add_category("Кровати")))
+        await queue.close()
+
+    run(scenario())
+
+    assert run(_category_names()) == ["Кровати"]
@@ -0,0 +1,181 @@
+"""
+Выгрузка таблиц каталога в ZIP с JSONL или CSV и онлайн-копия базы SQLite.
+
+Строки читаются потоком (stream + yield_per) и сразу пишутся в архив,
+поэтому память не зависит от размера таблиц. Все таблицы читаются в одной
+транзакции — выгрузка согласована, даже если бот в это время пишет.
+
+    python -m utils.catalog_export [--format jsonl|csv] [--output DIR] [--backup]
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import os
+import sqlite3
+import zipfile
+from datetime import date, datetime
+from typing import Dict
+
+from sqlalchemy import Table, select
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from database.engine import DATABASE_URL, apply_sqlite_pragmas, read_engine
+from database.models import Category, Cooperation, Furniture, FurniturePhoto, User
+from settings import config
+
+# Порядок как у внешних ключей: при загрузке обратно родители идут раньше
+EXPORT_TABLES = (
+    Category.__table__,
+    Furniture.__table__,
+    FurniturePhoto.__table__,
+    User.__table__,
+    Cooperation.__table__,
+)
+EXPORT_FORMATS = ("jsonl", "csv")
+
+# Сколько страниц копировать за шаг, если база не в WAL: между шагами писатель получает блокировку
+BACKUP_STEP_PAGES = 1024
+
+
+def timestamp() -> str:
+    return datetime.now().strftime("%Y%m%d-%H%M%S")
+
+
+def _json_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    return _json_value(value)
+
+
+async def _begin_snapshot(connection: AsyncConnection) -> None:
+    if connection.dialect.name == "sqlite":
+        # pysqlite не открывает транзакцию на SELECT — без BEGIN каждая таблица читалась бы отдельно
+        await connection.exec_driver_sql("BEGIN")
+    else:
+        await connection.execution_options(isolation_level="REPEATABLE READ")
+
+
+async def _write_table(connection: AsyncConnection,
+                       table: Table,
+                       stream: io.TextIOBase,
+                       fmt: str,
+                       chunk_size: int) -> int:
+    columns = [column.name for column in table.columns]
+    writer = None
+    if fmt == "csv":
+        writer = csv.writer(stream)
+        writer.writerow(columns)
+
+    rows = 0
+    stmt = select(table).order_by(*table.primary_key.columns).execution_options(yield_per=chunk_size)
+    result = await connection.stream(stmt)
+    async for partition in result.partitions():
+        for row in partition:
+            if writer is not None:
+                writer.writerow([_csv_value(value) for value in row])
+            else:
+                record = {column: _json_value(value) for column, value in zip(columns, row)}
+                stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        rows += len(partition)
+    return rows
+
+
+async def export_tables(archive_path: str,
+                        fmt: str = "jsonl",
+                        chunk_size: int = config.EXPORT_CHUNK_SIZE) -> Dict[str, int]:
+    """
+    Записать все таблицы EXPORT_TABLES в ZIP-архив, по файлу <таблица>.<fmt>.
+    Вернуть количество строк по таблицам.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Неизвестный формат выгрузки: {fmt}")
+
+    counts = {}
+    async with read_engine.connect() as connection:
+        await _begin_snapshot(connection)
+        with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for table in EXPORT_TABLES:
+                # Запись в архив потоком: файл таблицы целиком в памяти не собирается
+                with archive.open(f"{table.name}.{fmt}", "w", force_zip64=True) as raw:
+                    with io.TextIOWrapper(raw, encoding="utf-8", newline="") as stream:
+                        counts[table.name] = await _write_table(connection, table, stream, fmt, chunk_size)
+        await connection.rollback()
+    return counts
+
+
+def is_sqlite() -> bool:
+    return DATABASE_URL.get_backend_name() == "sqlite"
+
+
+def _sqlite_backup(source_path: str, destination: str) -> None:
+    source = sqlite3.connect(source_path)
+    target = sqlite3.connect(destination)
+    try:
+        # Тот же профиль, что у соединений бота (WAL, busy_timeout), но только чтение
+        apply_sqlite_pragmas(source)
+        source.execute("PRAGMA query_only=1")
+        journal_mode = source.execute("PRAGMA journal_mode").fetchone()[0]
+        if journal_mode.lower() == "wal":
+            # В WAL копия за один шаг — это одна читающая транзакция: читатели и писатель не ждут,
+            # а копия согласована на момент начала
+            source.backup(target)
+        else:
+            source.backup(target, pages=BACKUP_STEP_PAGES, sleep=0.01)
+    finally:
+        target.close()
+        source.close()
+
+
+async def backup_database(destination: str) -> str:
+    """
+    Онлайн-копия файла SQLite через backup API в destination. Бот продолжает
+    работать: копирование идет в отдельном потоке и не держит блокировку записи.
+    """
+    if not is_sqlite():
+        raise ValueError("Резервная копия через backup API доступна только для SQLite — для Postgres используйте pg_dump")
+
+    source_path = DATABASE_URL.database
+    if not source_path or source_path == ":memory:":
+        raise ValueError("База SQLite в памяти: копировать нечего")
+
+    await asyncio.to_thread(_sqlite_backup, source_path, destination)
+    return destination
+
+
+async def run(fmt: str, output: str, backup: bool) -> None:
+    os.makedirs(output, exist_ok=True)
+    stamp = timestamp()
+
+    archive_path = os.path.join(output, f"catalog-{stamp}-{fmt}.zip")
+    counts = await export_tables(archive_path, fmt)
+    for table, rows in counts.items():
+        print(f"{table}: {rows}")
+    print(f"Выгрузка: {archive_path}")
+
+    if backup:
+        backup_path = await backup_database(os.path.join(output, f"database-{stamp}.db"))
+        print(f"Резервная копия: {backup_path}")
+
+    await read_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="jsonl", help="формат файлов таблиц")
+    parser.add_argument("--output", default="export", help="папка для архива и копии базы")
+    parser.add_argument("--backup", action="store_true", help="дополнительно сделать копию базы SQLite")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.format, args.output, args.backup))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Разбор файла массового импорта каталога: CSV, JSONL или ZIP-архив с одним
+из них и фотографиями. Файл читается построчно, в памяти не держится целиком.
+
+Колонки (ключи JSON): description, category, country, subcategory, photos.
+В photos — file_id Telegram, ссылки http(s) или имена файлов из архива
+через «|» (в JSONL можно списком). Имена файлов могут содержать пробелы.
+"""
+import csv
+import io
+import json
+import os
+import zipfile
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+SUPPORTED_EXTENSIONS = (".csv", ".jsonl", ".ndjson", ".zip")
+TABLE_EXTENSIONS = (".csv", ".jsonl", ".ndjson")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+MAX_IMAGE_SIZE = 10 * 1024 * 1024  # лимит Telegram на фото
+
+# Допустимые названия колонок: как в базе, короткие и по-русски
+FIELD_ALIASES = {
+    "description": ("description", "описание"),
+    "category": ("category", "category_name", "категория"),
+    "country": ("country", "country_origin", "страна"),
+    "subcategory": ("subcategory", "kitchen_type", "подкатегория", "тип кухни"),
+    "photos": ("photos", "photo", "фото"),
+}
+
+PHOTO_SEPARATOR = "|"
+
+
+class ImportRow(NamedTuple):
+    line: int
+    description: str
+    category: str
+    country: str
+    subcategory: Optional[str]
+    photos: List[str]
+
+
+class RowError(NamedTuple):
+    line: int
+    message: str
+
+
+def _normalize(text: str) -> str:
+    """Сравнение без эмодзи, пробелов и регистра: «🛋️ Мягкая мебель» == «мягкая мебель»."""
+    return "".join(char for char in (text or "").lower() if char.isalnum())
+
+
+def photo_kind(reference: str) -> str:
+    if reference.startswith(("http://", "https://")):
+        return "url"
+    if reference.lower().endswith(IMAGE_EXTENSIONS):
+        return "file"
+    return "file_id"
+
+
+class CatalogSource:
+    """
+    Открытый файл импорта. records() лениво отдает (номер строки, словарь полей),
+    read_image() — байты фотографии из ZIP-архива. Оба метода читают файл синхронно —
+    из async-кода их вызывают через asyncio.to_thread (ZipFile допускает чтение из потоков).
+    """
+
+    def __init__(self, path: str, filename: Optional[str] = None):
+        self.path = path
+        self.filename = filename or os.path.basename(path)
+        self._archive: Optional[zipfile.ZipFile] = None
+        self._images: Dict[str, str] = {}
+
+    def __enter__(self) -> "CatalogSource":
+        if self.filename.lower().endswith(".zip"):
+            self._archive = zipfile.ZipFile(self.path)
+            # Фото ищем по имени файла без учета папок и регистра
+            for name in self._archive.namelist():
+                if name.lower().endswith(IMAGE_EXTENSIONS):
+                    self._images[os.path.basename(name).lower()] = name
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._archive is not None:
+            self._archive.close()
+
+    @property
+    def has_images(self) -> bool:
+        return bool(self._images)
+
+    def _open_table(self) -> Tuple[io.BufferedIOBase, str]:
+        if self._archive is None:
+            return open(self.path, "rb"), self.filename
+
+        tables = [
+            name for name in self._archive.namelist()
+            if name.lower().endswith(TABLE_EXTENSIONS) and not name.startswith("__MACOSX")
+        ]
+        if not tables:
+            raise ValueError("В архиве нет файла .csv или .jsonl")
+        return self._archive.open(tables[0]), tables[0]
+
+    def records(self) -> Iterator[Tuple[int, dict]]:
+        raw, name = self._open_table()
+        with io.TextIOWrapper(raw, encoding="utf-8-sig", newline="") as stream:
+            if name.lower().endswith(".csv"):
+                yield from self._csv_records(stream)
+            else:
+                yield from self._jsonl_records(stream)
+
+    @staticmethod
+    def _csv_records(stream: io.TextIOWrapper) -> Iterator[Tuple[int, dict]]:
+        sample = stream.read(4096)
+        stream.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+
+        reader = csv.DictReader(stream, dialect=dialect)
+        for record in reader:
+            yield reader.line_num, record
+
+    @staticmethod
+    def _jsonl_records(stream: io.TextIOWrapper) -> Iterator[Tuple[int, dict]]:
+        for line, text in enumerate(stream, start=1):
+            text = text.strip()
+            if not text:
+                continue
+            try:
+                record = json.loads(text)
+            except json.JSONDecodeError as exc:
+                record = {"__error__": f"некорректный JSON: {exc.msg}"}
+            if not isinstance(record, dict):
+                record = {"__error__": "ожидается JSON-объект"}
+            yield line, record
+
+    def read_image(self, reference: str) -> Optional[bytes]:
+        name = self._images.get(os.path.basename(reference).lower())
+        if name is None:
+            return None
+        if self._archive.getinfo(name).file_size > MAX_IMAGE_SIZE:
+            raise ValueError(f"{reference}: больше 10 МБ")
+        return self._archive.read(name)
+
+
+class RowValidator:
+    """
+    Проверяет запись по справочникам: категория из таблицы categories,
+    страна и тип кухни из тех же списков, что и в мастере добавления мебели.
+    """
+
+    def __init__(self,
+                 categories: Iterable[str],
+                 countries: Iterable[str],
+                 kitchen_types: Iterable[str],
+                 max_photos: int,
+                 default_country: str):
+        self.categories = {_normalize(name): name for name in categories}
+        self.countries = {_normalize(name): name for name in countries}
+        self.kitchen_types = {_normalize(name): name for name in kitchen_types}
+        self.max_photos = max_photos
+        self.default_country = default_country
+
+    @staticmethod
+    def _field(record: dict, field: str):
+        for alias in FIELD_ALIASES[field]:
+            for key, value in record.items():
+                if key and key.strip().lower() == alias:
+                    return value
+        return None
+
+    @staticmethod
+    def _text(value) -> str:
+        return str(value).strip() if value is not None else ""
+
+    def validate(self, line: int, record: dict) -> Tuple[Optional[ImportRow], List[RowError]]:
+        """
+        Вернуть строку для импорта (или None, если ее нельзя импортировать)
+        и список замечаний по ней для отчета.
+        """
+        if "__error__" in record:
+            return None, [RowError(line, record["__error__"])]
+
+        description = self._text(self._field(record, "description"))
+        category_value = self._text(self._field(record, "category"))
+        country_value = self._text(self._field(record, "country"))
+        subcategory_value = self._text(self._field(record, "subcategory"))
+
+        errors = []
+        if not description:
+            errors.append(RowError(line, "пустое описание"))
+
+        category = self.categories.get(_normalize(category_value))
+        if category is None:
+            errors.append(RowError(line, f"категория «{category_value}» не найдена"))
+
+        is_kitchen = category is not None and "кухонная" in category.lower()
+        subcategory = None
+        if is_kitchen:
+            # Как в мастере: у кухонь страна по умолчанию и обязательный тип кухни
+            country_value = country_value or self.default_country
+            subcategory = self.kitchen_types.get(_normalize(subcategory_value))
+            if subcategory is None:
+                errors.append(RowError(line, f"тип кухни «{subcategory_value}» не найден"))
+
+        country = self.countries.get(_normalize(country_value))
+        if country is None:
+            errors.append(RowError(line, f"страна «{country_value}» не найдена"))
+
+        if errors:
+            return None, errors
+
+        photos_value = self._field(record, "photos")
+        if isinstance(photos_value, list):
+            photos = [self._text(photo) for photo in photos_value if self._text(photo)]
+        else:
+            photos = [photo.strip() for photo in self._text(photos_value).split(PHOTO_SEPARATOR) if photo.strip()]
+
+        # Лишние фото — не причина отбрасывать товар
+        warnings = []
+        if len(photos) > self.max_photos:
+            warnings.append(RowError(line, f"фото больше {self.max_photos}, лишние пропущены"))
+            photos = photos[:self.max_photos]
+
+        return ImportRow(line, description, category, country, subcategory, photos), warnings
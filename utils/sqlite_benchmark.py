@@ -0,0 +1,147 @@
+"""
+Бенчмарк SQLite: чтения каталога параллельно с записями CrudFurniture.create_furniture.
+
+Запускает один и тот же сценарий на временной базе с двумя профилями PRAGMA —
+настройками SQLite по умолчанию и профилем из settings/config.py — и печатает
+задержки чтений и скорость записей.
+
+    python -m utils.sqlite_benchmark [--items 2000] [--readers 4] [--writers 4] [--writes 200]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Профиль SQLite по умолчанию: rollback-журнал, fsync на каждый коммит, без ожидания блокировок
+DEFAULT_PROFILE = {
+    "SQLITE_JOURNAL_MODE": "DELETE",
+    "SQLITE_SYNCHRONOUS": "FULL",
+    "SQLITE_BUSY_TIMEOUT": "",
+    "SQLITE_MMAP_SIZE": "",
+    "SQLITE_CACHE_SIZE": "",
+    "SQLITE_TEMP_STORE": "",
+}
+
+CATEGORY = "🛋️ Мягкая мебель"
+COUNTRY = "🇷🇺 Россия"
+
+
+async def run_scenario(items: int, readers: int, writers: int, writes: int) -> dict:
+    # Импорт после настройки окружения: engine создается при импорте с DATABASE_URL и PRAGMA из env
+    from sqlalchemy import insert
+
+    from database.crud import CrudFurniture
+    from database.engine import async_engine, AsyncSessionLocal
+    from database.models import Base, Category, Furniture
+
+    async with async_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(insert(Category).values(name=CATEGORY))
+        await session.execute(insert(Furniture), [
+            {"description": f"Диван №{number}", "category_name": CATEGORY, "country_origin": COUNTRY}
+            for number in range(items)
+        ])
+        await session.commit()
+
+    crud = CrudFurniture()
+    read_latencies = []
+    read_errors = 0
+    writes_done = 0
+    writing = True
+
+    async def writer(numbers: range):
+        nonlocal writes_done
+        for number in numbers:
+            if await crud.create_furniture(f"Новый диван №{number}", CATEGORY, COUNTRY) is not None:
+                writes_done += 1
+
+    async def all_writers():
+        nonlocal writing
+        # Параллельные писатели попадают в общую очередь записей и фиксируются пачками
+        await asyncio.gather(*(writer(range(number, writes, writers)) for number in range(writers)))
+        writing = False
+
+    async def reader(offset: int):
+        nonlocal read_errors
+        after_id = offset
+        while writing:
+            started = time.perf_counter()
+            page = await crud.get_furniture_page(CATEGORY, COUNTRY, after_id=after_id, limit=10)
+            read_latencies.append(time.perf_counter() - started)
+            if not page:
+                read_errors += 1
+            after_id = (after_id + 10) % items
+
+    started = time.perf_counter()
+    await asyncio.gather(all_writers(), *(reader(number * items // readers) for number in range(readers)))
+    elapsed = time.perf_counter() - started
+    await async_engine.dispose()
+
+    read_latencies.sort()
+    return {
+        "elapsed": elapsed,
+        "writes": writes_done,
+        "writes_per_sec": writes_done / elapsed,
+        "reads": len(read_latencies),
+        "reads_per_sec": len(read_latencies) / elapsed,
+        "read_p50_ms": statistics.median(read_latencies) * 1000 if read_latencies else 0,
+        "read_p95_ms": read_latencies[int(len(read_latencies) * 0.95)] * 1000 if read_latencies else 0,
+        "read_max_ms": read_latencies[-1] * 1000 if read_latencies else 0,
+        "failed_reads": read_errors,
+    }
+
+
+def run_profile(name: str, overrides: dict, args: argparse.Namespace) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, **overrides)
+        env["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(directory, 'benchmark.db')}"
+        # Кеш каталога отключен, чтобы каждое чтение доходило до базы
+        env["CATALOG_CACHE_SIZE"] = "0"
+        output = subprocess.run(
+            [sys.executable, "-m", "utils.sqlite_benchmark", "--worker",
+             "--items", str(args.items), "--readers", str(args.readers),
+             "--writers", str(args.writers), "--writes", str(args.writes)],
+            env=env, check=True, capture_output=True, text=True,
+        ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["profile"] = name
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=2000, help="сколько товаров в базе перед замером")
+    parser.add_argument("--readers", type=int, default=4, help="сколько параллельных читателей")
+    parser.add_argument("--writers", type=int, default=4, help="сколько параллельных писателей")
+    parser.add_argument("--writes", type=int, default=200, help="сколько товаров добавить за замер")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(asyncio.run(run_scenario(args.items, args.readers, max(1, args.writers), args.writes))))
+        return
+
+    results = [
+        run_profile("sqlite default", DEFAULT_PROFILE, args),
+        run_profile("config profile", {}, args),
+    ]
+
+    columns = ["profile", "elapsed", "writes_per_sec", "reads_per_sec",
+               "read_p50_ms", "read_p95_ms", "read_max_ms", "failed_reads"]
+    print(" | ".join(f"{column:>15}" for column in columns))
+    for result in results:
+        print(" | ".join(
+            f"{result[column]:>15.2f}" if isinstance(result[column], float) else f"{result[column]:>15}"
+            for column in columns
+        ))
+
+
+if __name__ == "__main__":
+    main()